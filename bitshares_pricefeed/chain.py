@@ -0,0 +1,129 @@
+import threading
+
+from bitshares.asset import Asset
+from bitshares.price import PriceFeed
+from bitshares.exceptions import AssetDoesNotExistsException
+from bitshares.instance import shared_bitshares_instance
+
+import logging
+log = logging.getLogger(__name__)
+
+
+class ChainSnapshot(object):
+    """ The chain state a run reads, fetched in bulk
+
+        The assets, their bitasset and dynamic data, their short backing
+        assets and the feeds published for them are loaded in three RPC
+        calls, however many assets there are:
+
+        * ``lookup_asset_symbols`` for the assets,
+        * ``get_objects`` for their bitasset and dynamic data,
+        * ``get_objects`` for the backing assets not loaded yet.
+
+        The assets are kept as fully loaded :class:`bitshares.asset.Asset`
+        instances, with the backing asset in ``short_backing_asset``, and
+        are put into the library's object cache so that prices and feeds
+        built from them resolve their assets without querying the chain.
+
+        :param list symbols: assets to load
+        :param str producer: id of the account whose feeds to look up
+        :param bitshares.BitShares blockchain_instance: node connection
+    """
+    def __init__(self, symbols=(), producer=None, blockchain_instance=None):
+        self.blockchain = blockchain_instance or shared_bitshares_instance()
+        self.producer = producer
+        self.assets = {}
+        self.lock = threading.RLock()
+        self.load(symbols)
+
+    def load(self, symbols):
+        """ Load the assets ``symbols`` not loaded yet
+        """
+        with self.lock:
+            self._load(symbols)
+
+    def _load(self, symbols):
+        symbols = [symbol for symbol in dict.fromkeys(symbols) if symbol not in self.assets]
+        if not symbols:
+            return
+        rpc = self.blockchain.rpc
+        found = dict(zip(symbols, rpc.lookup_asset_symbols(symbols)))
+        loaded = dict((symbol, data) for symbol, data in found.items() if data)
+
+        ids = []
+        for data in loaded.values():
+            ids.append(data["dynamic_asset_data_id"])
+            if "bitasset_data_id" in data:
+                ids.append(data["bitasset_data_id"])
+        objects = self.get_objects(ids)
+        for data in loaded.values():
+            data["dynamic_asset_data"] = objects[data["dynamic_asset_data_id"]]
+            if "bitasset_data_id" in data:
+                data["bitasset_data"] = objects[data["bitasset_data_id"]]
+
+        known = dict((asset["id"], asset) for asset in self.assets.values() if asset)
+        for symbol, data in found.items():
+            self.assets[symbol] = data and self.asset_from(data, full=True)
+            if data:
+                known[data["id"]] = self.assets[symbol]
+
+        backing_ids = set(
+            data["bitasset_data"]["options"]["short_backing_asset"]
+            for data in loaded.values() if "bitasset_data" in data)
+        backing = self.get_objects([x for x in backing_ids if x not in known])
+        for asset_id, data in backing.items():
+            known[asset_id] = self.asset_from(data)
+        for symbol, data in loaded.items():
+            if "bitasset_data" in data:
+                backing_id = data["bitasset_data"]["options"]["short_backing_asset"]
+                self.assets[symbol]["short_backing_asset"] = known[backing_id]
+        log.info("Loaded %d assets from the chain", len(loaded))
+
+    def get_objects(self, ids):
+        """ Objects by id, in a single call
+        """
+        if not ids:
+            return {}
+        return dict(zip(ids, self.blockchain.rpc.get_objects(ids)))
+
+    def asset_from(self, data, full=False):
+        asset = Asset(data, full=full, blockchain_instance=self.blockchain)
+        # Cached by id on creation, by symbol as Asset.refresh does
+        asset.store(asset, asset["symbol"])
+        return asset
+
+    def asset(self, symbol):
+        """ The fully loaded asset ``symbol``, loaded if not yet
+
+            :raises AssetDoesNotExistsException: if there is no such asset
+        """
+        self.load([symbol])
+        asset = self.assets[symbol]
+        if not asset:
+            raise AssetDoesNotExistsException(symbol)
+        return asset
+
+    def backing_asset(self, symbol):
+        """ The short backing asset of ``symbol``, ``None`` if it is not a
+            bitasset
+        """
+        asset = self.asset(symbol)
+        if not asset.is_bitasset:
+            return
+        return asset["short_backing_asset"]
+
+    def current_feed(self, symbol):
+        """ The feed the producer currently publishes for ``symbol``, as
+            :class:`bitshares.price.PriceFeed`, ``None`` if there is none
+        """
+        asset = self.asset(symbol)
+        if not asset.is_bitasset:
+            return
+        for feed in asset["bitasset_data"]["feeds"]:
+            if feed[0] == self.producer:
+                return PriceFeed(feed, blockchain_instance=self.blockchain)
+
+    def global_feed(self, symbol):
+        """ The median feed of ``symbol`` on the chain
+        """
+        return self.asset(symbol).feed
@@ -9,11 +9,13 @@ from bitshares.price import Price
 from bitshares.account import Account
 # from bitshares.asset import Asset
 from .pricefeed import Feed
+from .daemon import Daemon
 from uptick.decorators import (
     # verbose,
     chain,
     unlock,
 )
+from . import ui
 from .ui import (
     configfile,
     print_log,
@@ -35,13 +37,15 @@ log = logging.getLogger(__name__)
 @click.option(
     "--node",
     metavar='<wss://host:port>',
-    help="Node to connect to",
+    multiple=True,
+    help="Node to connect to, repeat to use several nodes",
 )
 @click.pass_context
 def main(ctx, **kwargs):
     ctx.obj = {}
     for k, v in kwargs.items():
         ctx.obj[k] = v
+    ctx.obj["node"] = list(ctx.obj["node"]) or None
 
 
 @main.command()
@@ -151,7 +155,7 @@ def configure_active_key(ctx, param, value):
 )
 @click.pass_context
 @configfile
-@chain
+@ui.chain
 @unlock
 @click.argument(
     "assets",
@@ -161,14 +165,12 @@ def configure_active_key(ctx, param, value):
 def update(ctx, assets, dry_run, confirm_warning, skip_critical):
     """ Update price feed for assets
     """
-    exitcode = 0
-
     # Do i have a producer?
     assert "producer" in ctx.config and ctx.config["producer"], \
         "Please provide a feed producer name in the configuration!"
 
     feed = Feed(config=ctx.config)
-    feed.fetch()
+    feed.fetch(assets=assets)
     feed.derive(assets)
     prices = feed.get_prices()
     print_log(prices)
@@ -178,7 +180,22 @@ def update(ctx, assets, dry_run, confirm_warning, skip_critical):
     if dry_run:
         return
 
+    exitcode = publish(ctx, prices, confirm_warning, skip_critical)
+    if exitcode is not None:
+        sys.exit(exitcode)
+
+
+def publish(ctx, prices, confirm_warning=True, skip_critical=False, interactive=True):
+    """ Publish the prices that need it in one transaction. Returns the
+        exit code, None if the publication was not confirmed.
+    """
+    exitcode = 0
+    if not interactive:
+        # Nobody to ask, skip what would need a confirmation
+        skip_critical = True
+
     # Bundle all operation in one transaction.
+    ctx.bitshares.txbuffer.clear()
     ctx.bitshares.bundle = True
     # Assert that we sign the transactions.
     ctx.bitshares.unsigned = False
@@ -203,6 +220,19 @@ def update(ctx, assets, dry_run, confirm_warning, skip_critical):
         if "min_change" not in flags and "over_max_age" in flags:
             print('Price of %s is tool old, forcing republication.' % (symbol, ))
 
+        if (
+            not interactive and
+            "over_warn_change" in flags and
+            "skip_change" not in flags
+        ):
+            alert(
+                "Price change for %s (%f) has been above 'warn_change'.  Skipping!" % (
+                    symbol,
+                    price["priceChange"],
+                )
+            )
+            continue
+
         if (
             confirm_warning and
             "over_warn_change" in flags and
@@ -260,6 +290,9 @@ def update(ctx, assets, dry_run, confirm_warning, skip_critical):
 
     # Always ask for confirmation if this flag is set to true
     if "confirm" in ctx.config and ctx.config["confirm"]:
+        if not interactive:
+            alert("Publication needs a confirmation ('confirm' is set), skipping.")
+            return
         if not confirmwarning(
             "Please confirm"
         ):
@@ -268,7 +301,61 @@ def update(ctx, assets, dry_run, confirm_warning, skip_critical):
     if ctx.bitshares.txbuffer.ops:
         ctx.bitshares.txbuffer.broadcast()
 
-    sys.exit(exitcode)
+    return exitcode
+
+
+@main.command()
+@click.option(
+    "--dry-run",
+    is_flag=True,
+    help="Only compute prices and print result, no publication.",
+    default=False,
+    callback=configure_dry_run,
+    is_eager=True
+)
+@click.option(
+    "--active-key",
+    metavar='WIF',
+    help="Active key to be used to sign transactions.",
+    callback=configure_active_key,
+    expose_value=False,
+    is_eager=True
+)
+@click.option(
+    "--interval",
+    help="Time between two updates, e.g. 300 or 5m (default: 'run: interval' of the configuration, else 5m)",
+)
+@click.pass_context
+@configfile
+@ui.chain
+@unlock
+@click.argument(
+    "assets",
+    nargs=-1,
+    required=False,
+)
+def run(ctx, assets, dry_run, interval):
+    """ Keep updating price feeds for assets, until interrupted
+
+        Feeds needing a confirmation (warn_change, skip_change, confirm)
+        are skipped.
+    """
+    assert "producer" in ctx.config and ctx.config["producer"], \
+        "Please provide a feed producer name in the configuration!"
+
+    def update_prices(prices):
+        print_log(prices)
+        print_prices(prices)
+        print_premium_details(prices)
+        if not dry_run:
+            publish(ctx, prices, interactive=False)
+
+    settings = ctx.config.get("run") or {}
+    Daemon(
+        Feed(config=ctx.config),
+        update_prices,
+        interval=interval or settings.get("interval", 300),
+        assets=assets).run()
 
 
 if __name__ == '__main__':
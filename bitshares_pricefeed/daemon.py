@@ -0,0 +1,100 @@
+import signal
+import threading
+import time
+import traceback
+
+from .sources import parse_duration
+
+import logging
+log = logging.getLogger(__name__)
+
+
+class Daemon(object):
+    """ Run fetch, derive and publish cycles with one long lived
+        :class:`Feed`
+
+        The feed keeps its HTTP connection pools, chain connection,
+        snapshot of the chain state and caches from one cycle to the
+        next. A cycle starts every ``interval`` seconds:
+
+        * the exchanges that are due are fetched: by default every
+          exchange on every cycle, exchanges with a ``fetchInterval``
+          every that many seconds. The others keep their last feed. Only
+          exchanges the prices of ``assets`` can be derived from are
+          fetched, see :meth:`Feed.select_exchanges`.
+        * the chain state is read again, whether exchanges were fetched
+          or not.
+        * the prices of ``assets`` are derived,
+        * ``publish`` is called with the derived prices.
+
+        A failing cycle is reported and the next one runs as planned.
+        SIGINT and SIGTERM stop the daemon once the current cycle is done.
+
+        :param Feed feed: the feed to keep updating
+        :param callable publish: called with the derived prices
+        :param float interval: seconds between the start of two cycles
+        :param list assets: assets to derive, all configured assets by
+            default
+    """
+    def __init__(self, feed, publish, interval=300, assets=()):
+        self.feed = feed
+        self.publish = publish
+        self.interval = parse_duration(interval)
+        self.assets = assets
+        self.fetched = {}
+        self.cycles = 0
+        self.stopping = threading.Event()
+
+    def due(self, now):
+        """ Names of the exchanges to fetch at ``now``
+        """
+        names = []
+        for name, exchange in (self.feed.config.get("exchanges") or {}).items():
+            if "enable" in exchange and not exchange["enable"]:
+                continue
+            period = parse_duration(exchange.get("fetchInterval")) or 0
+            if name not in self.fetched or now - self.fetched[name] >= period:
+                names.append(name)
+        return names
+
+    def cycle(self):
+        now = time.time()
+        names = self.due(now)
+        if names:
+            log.info("Fetching %s", ", ".join(names))
+            self.feed.fetch(names, self.assets)
+            for name in names:
+                self.fetched[name] = now
+        else:
+            self.feed.new_run()
+        prices = self.feed.derive(self.assets)
+        self.publish(prices)
+        self.cycles += 1
+        log.info("Cycle %d done in %.2fs", self.cycles, time.time() - now)
+
+    def run(self):
+        """ Run cycles until stopped
+        """
+        handlers = {}
+        if threading.current_thread() is threading.main_thread():
+            for signum in (signal.SIGINT, signal.SIGTERM):
+                handlers[signum] = signal.signal(signum, self.stop)
+        try:
+            while not self.stopping.is_set():
+                start = time.time()
+                try:
+                    self.cycle()
+                except (Exception, SystemExit):
+                    # e.g. a source that may not fail did, try again next cycle
+                    print("Cycle failed:\n{}".format(traceback.format_exc()))
+                self.stopping.wait(max(0, self.interval - (time.time() - start)))
+        finally:
+            for signum, handler in handlers.items():
+                signal.signal(signum, handler)
+        print("Stopped after {} cycles".format(self.cycles))
+
+    def stop(self, *args):
+        """ Stop once the current cycle is done
+        """
+        log.info("Stopping")
+        self.stopping.set()
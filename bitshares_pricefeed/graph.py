@@ -0,0 +1,480 @@
+import itertools
+import numpy as num
+
+import logging
+log = logging.getLogger(__name__)
+
+
+def get_source_description(datasource, base, quote, data):
+    return '{} - {}:{}'.format(data['source'] if 'source' in data else datasource, base, quote)
+
+
+class SymbolTable(object):
+    """ Interned symbols: every symbol gets a small integer id
+    """
+    def __init__(self):
+        self.ids = {}
+        self.names = []
+
+    def id(self, symbol):
+        if symbol not in self.ids:
+            self.ids[symbol] = len(self.names)
+            self.names.append(symbol)
+        return self.ids[symbol]
+
+
+class Provenance(object):
+    """ Interned provenance of prices
+
+        An edge is one price of a source, i.e. a source and a market. A
+        path is the tuple of edges a price was derived from. Edges and
+        paths are interned as small integer ids, their human readable
+        descriptions are only built on request (see :meth:`describe`).
+
+        :param SymbolTable symbols: symbols of the markets
+    """
+    def __init__(self, symbols):
+        self.symbols = symbols
+        self.edges = []
+        self.labels = {}
+        self.paths = []
+        self.ids = {}
+
+    def edge(self, datasource, base, quote):
+        """ A new edge for a price of ``datasource`` in ``base:quote``
+        """
+        self.edges.append((datasource, self.symbols.id(base), self.symbols.id(quote)))
+        return len(self.edges) - 1
+
+    def label(self, description):
+        """ The edge of a free form source description
+        """
+        if description not in self.labels:
+            self.edges.append((description,))
+            self.labels[description] = len(self.edges) - 1
+        return self.labels[description]
+
+    def path(self, edges):
+        """ Id of a path, given as edge ids or source descriptions
+        """
+        edges = tuple(self.label(x) if isinstance(x, str) else x for x in edges)
+        if edges not in self.ids:
+            self.ids[edges] = len(self.paths)
+            self.paths.append(edges)
+        return self.ids[edges]
+
+    def describe_edge(self, edge):
+        record = self.edges[edge]
+        if len(record) == 1:
+            return record[0]
+        return '{} - {}:{}'.format(record[0], self.symbols.names[record[1]], self.symbols.names[record[2]])
+
+    def describe(self, path):
+        """ Source descriptions of a path id
+        """
+        return [self.describe_edge(x) for x in self.paths[path]]
+
+
+class PriceStore(object):
+    """ Columnar storage of prices
+
+        Prices are stored in contiguous arrays (price, volume, base and
+        quote symbol ids, source path id and source id), sorted by market
+        so that the prices of a market are a slice of each column. The
+        pair index maps ``(base, quote)`` ids to that slice.
+
+        A store created with a ``parent`` holds prices added on top of
+        the parent's, which is read but never modified. Both share the
+        same :class:`SymbolTable` and :class:`Provenance`.
+
+        :param PriceStore parent: store whose prices this one extends
+    """
+    def __init__(self, parent=None, symbols=None, provenance=None):
+        self.parent = parent
+        if parent is not None:
+            self.symbols = parent.symbols
+            self.provenance = parent.provenance
+        else:
+            self.symbols = symbols or SymbolTable()
+            self.provenance = provenance or Provenance(self.symbols)
+        self.pending = []
+        self.set_columns(
+            num.empty(0), num.empty(0),
+            num.empty(0, dtype=num.int32), num.empty(0, dtype=num.int32),
+            num.empty(0, dtype=num.int32), num.empty(0, dtype=num.int32))
+
+    def set_columns(self, price, volume, base, quote, path, source):
+        """ Set (already sorted by market) columns and rebuild the index
+        """
+        self.price = price
+        self.volume = volume
+        self.base = base
+        self.quote = quote
+        self.path = path
+        self.source = source
+        self.index = {}
+        self.markets = {}
+        if not len(price):
+            return
+        keys = (base.astype(num.int64) << 32) | quote
+        changes = num.flatnonzero(num.diff(keys)) + 1
+        starts = num.concatenate(([0], changes))
+        stops = num.concatenate((changes, [len(keys)]))
+        for start, stop in zip(starts.tolist(), stops.tolist()):
+            market = (int(base[start]), int(quote[start]))
+            self.index[market] = slice(start, stop)
+            self.markets.setdefault(market[0], set()).add(market[1])
+
+    def add(self, base, quote, price, volume, path, source=-1):
+        self.add_many(base, quote, [price], [volume], [path], source)
+
+    def add_many(self, base, quote, prices, volumes, paths, source=-1):
+        """ Add prices of the market ``base:quote``, ``paths`` being the
+            edges (see :class:`Provenance`) each price was derived from
+        """
+        count = len(prices)
+        self.extend([base] * count, [quote] * count, prices, volumes, paths, [source] * count)
+
+    def extend(self, bases, quotes, prices, volumes, paths, sources):
+        """ Add prices of any markets, one per element of the arguments
+        """
+        count = len(prices)
+        if not count:
+            return
+        path_ids = num.array([self.provenance.path(x) for x in paths], dtype=num.int32)
+        self.pending.append((
+            num.asarray(prices, dtype=num.float64),
+            num.asarray(volumes, dtype=num.float64),
+            num.array([self.symbols.id(x) for x in bases], dtype=num.int32),
+            num.array([self.symbols.id(x) for x in quotes], dtype=num.int32),
+            path_ids,
+            num.asarray(sources, dtype=num.int32)))
+
+    def flush(self):
+        """ Merge the prices added since the last query into the columns
+        """
+        if not self.pending:
+            return
+        columns = [
+            num.concatenate([column] + [chunk[i] for chunk in self.pending])
+            for i, column in enumerate((self.price, self.volume, self.base, self.quote, self.path, self.source))]
+        self.pending = []
+        # Stable sort, prices of a market keep the order they were added in
+        order = num.lexsort((columns[3], columns[2]))
+        self.set_columns(*[column[order] for column in columns])
+
+    def own_slice(self, base, quote):
+        self.flush()
+        base_id = self.symbols.ids.get(base)
+        quote_id = self.symbols.ids.get(quote)
+        return self.index.get((base_id, quote_id), slice(0, 0))
+
+    def column(self, name, base, quote):
+        rows = self.own_slice(base, quote)
+        own = getattr(self, name)[rows]
+        if self.parent is None:
+            return own
+        return num.concatenate((self.parent.column(name, base, quote), own))
+
+    def prices(self, base, quote):
+        return self.column("price", base, quote)
+
+    def volumes(self, base, quote):
+        return self.column("volume", base, quote)
+
+    def paths(self, base, quote):
+        """ Edges each price of a market was derived from
+        """
+        return [self.provenance.paths[i] for i in self.column("path", base, quote).tolist()]
+
+    def sources(self, base, quote):
+        """ Source descriptions of each price of a market
+        """
+        return [self.provenance.describe(i) for i in self.column("path", base, quote).tolist()]
+
+    def quotes(self, base):
+        """ Symbols ``base`` has prices in
+        """
+        self.flush()
+        quotes = set(self.symbols.names[i] for i in self.markets.get(self.symbols.ids.get(base), ()))
+        if self.parent is not None:
+            quotes |= self.parent.quotes(base)
+        return quotes
+
+    def entries(self, base, quote):
+        """ Prices of a market as ``dict(price=, volume=, sources=)``, e.g.
+            for display
+        """
+        return [
+            dict(price=price, volume=volume, sources=sources)
+            for price, volume, sources in zip(
+                self.prices(base, quote).tolist(),
+                self.volumes(base, quote).tolist(),
+                self.sources(base, quote))]
+
+    def __contains__(self, base):
+        return bool(self.quotes(base))
+
+
+class PriceGraph(object):
+    """ Prices of all sources fetched in a run, built once per run
+
+        Every market of every source is an edge ``base -> quote``. Since
+        markets are symmetric, each one also gives the inverted edge
+        ``quote -> base``, its volume being derived at spot price. Markets
+        with no volume are skipped.
+
+        Assets only read a :meth:`view` of the graph restricted to their
+        sources. Views are built once per set of sources and shared,
+        they must not be modified.
+
+        :param dict feed: fetched feeds by source name
+        :param dict exchanges: exchanges configuration, disabled ones are
+            skipped
+    """
+    def __init__(self, feed, exchanges=None):
+        self.views = {}
+        self.datasources = SymbolTable()
+        self.store = PriceStore()
+        exchanges = exchanges or {}
+        edges = []
+        for datasource, data in feed.items():
+            if not exchanges.get(datasource, {}).get("enable", True):
+                continue
+            source = self.datasources.id(datasource)
+            edges.extend(edge + (source,) for edge in self.extract_edges(datasource, data or {}))
+        if edges:
+            bases, quotes, prices, volumes, labels, sources = zip(*edges)
+            provenance = self.store.provenance
+            self.store.extend(bases, quotes, prices, volumes, [
+                (provenance.edge(label, base, quote),) for base, quote, label in zip(bases, quotes, labels)
+            ], sources)
+        self.store.flush()
+
+    @staticmethod
+    def extract_edges(datasource, data):
+        for base in list(data):
+            if base == "response":  # skip entries that store debug data
+                continue
+            for quote in list(data[base]):
+                if quote == "response":  # skip entries that store debug data
+                    continue
+                if not base or not quote:
+                    continue
+
+                feed_data = data[base][quote]
+                # Skip markets with zero trades in the last 24h
+                if feed_data["volume"] == 0.0:
+                    continue
+
+                # Original price/volume
+                label = feed_data['source'] if 'source' in feed_data else datasource
+                yield base, quote, feed_data["price"], feed_data["volume"], label
+
+                if feed_data["price"] > 0 and feed_data["volume"] > 0:
+                    # Inverted pair price/volume
+                    yield (
+                        quote, base, float(1.0 / feed_data["price"]), float(feed_data["volume"] * feed_data["price"]),
+                        label)
+
+    def view(self, datasources):
+        """ Prices of the given sources, as a :class:`PriceStore`
+        """
+        key = frozenset(datasources)
+        if key not in self.views:
+            store = self.store
+            ids = [self.datasources.ids[x] for x in key if x in self.datasources.ids]
+            mask = num.isin(store.source, ids)
+            view = PriceStore(symbols=store.symbols, provenance=store.provenance)
+            view.set_columns(*[
+                column[mask] for column in (
+                    store.price, store.volume, store.base, store.quote, store.path, store.source)])
+            self.views[key] = view
+        return self.views[key]
+
+
+class Route(object):
+    """ Prices derived through one chain of markets ``symbols``
+    """
+    def __init__(self, symbols, prices, volumes, quality, paths):
+        self.symbols = symbols
+        self.prices = prices
+        self.volumes = volumes
+        self.quality = quality
+        self.paths = paths
+
+
+class RouteFinder(object):
+    """ Derive the prices of a market through chains of other markets
+
+        Routes go from the base symbol through up to ``max_hops - 1``
+        distinct intermediate assets to the target symbol, e.g. with
+        ``max_hops=4``: ``XAF:EUR -> EUR:USD -> USD:BTC -> BTC:BTS``.
+        Every combination of the prices of each market of a route gives
+        a derived price, computed as a sum in log-price space. Like a
+        direct price, it is weighted by the volume of the target market.
+
+        To keep the number of combinations bounded, markets are pruned
+        first: prices below ``min_volume`` are dropped, and at most
+        ``fan_out`` prices (by volume) are kept per market. The quality
+        of a derived price is the smallest share, over its markets, of
+        the price's volume in the market's largest volume, divided by
+        the number of markets; only the ``max_routes`` best derived
+        prices are kept. Combinations that reuse the same prices are
+        only derived once.
+
+        :param PriceStore store: prices to derive from
+        :param list intermediates: symbols routes may go through
+        :param int max_hops: maximum number of markets in a route
+        :param float min_volume: minimum volume of a price to be used
+        :param int fan_out: maximum number of prices used per market
+        :param int max_routes: maximum number of derived prices
+
+        The symbols whose markets were looked up are collected in
+        ``visited``: the routes only depend on markets of these symbols.
+    """
+    def __init__(self, store, intermediates, max_hops=2, min_volume=0.0, fan_out=None, max_routes=None):
+        self.store = store
+        self.intermediates = list(dict.fromkeys(intermediates))
+        self.max_hops = max_hops
+        self.min_volume = min_volume or 0.0
+        self.fan_out = fan_out
+        self.max_routes = max_routes
+        self.pruned = {}
+        self.visited = set()
+
+    def market(self, base, quote):
+        """ Pruned ``(log prices, volumes, shares, paths)`` of a market
+        """
+        if (base, quote) not in self.pruned:
+            prices = self.store.prices(base, quote)
+            volumes = self.store.volumes(base, quote)
+            paths = self.store.paths(base, quote)
+            keep = num.flatnonzero((prices > 0) & (volumes > 0) & (volumes >= self.min_volume))
+            if self.fan_out and len(keep) > self.fan_out:
+                # Largest volumes first, ties in the original order
+                keep = num.sort(keep[num.argsort(-volumes[keep], kind="mergesort")[:self.fan_out]])
+            shares = volumes[keep] / volumes[keep].max() if len(keep) else volumes[keep]
+            self.pruned[(base, quote)] = (
+                num.log(prices[keep]), volumes[keep], shares, [paths[i] for i in keep.tolist()])
+        return self.pruned[(base, quote)]
+
+    def paths(self, base, target):
+        """ Chains of symbols from ``base`` to ``target`` of 2 up to
+            ``max_hops`` markets
+        """
+        stack = [[base]]
+        while stack:
+            path = stack.pop()
+            self.visited.add(path[-1])
+            quotes = self.store.quotes(path[-1])
+            if len(path) >= 2 and target in quotes:
+                yield path + [target]
+            if len(path) >= self.max_hops:
+                continue
+            for symbol in reversed(self.intermediates):
+                if symbol in quotes and symbol not in path and symbol != target:
+                    stack.append(path + [symbol])
+
+    def routes(self, base, target):
+        """ Derived prices of ``base:target``, as :class:`Route` objects
+        """
+        routes = []
+        seen = set()
+        for path in self.paths(base, target):
+            markets = [self.market(a, b) for a, b in zip(path, path[1:])]
+            if not all(len(x[0]) for x in markets):
+                continue
+            shape = [len(x[0]) for x in markets]
+            log_prices = num.zeros(shape)
+            shares = num.ones(shape)
+            for axis, (logs, _, share, _) in enumerate(markets):
+                index = [None] * len(markets)
+                index[axis] = slice(None)
+                log_prices = log_prices + logs[tuple(index)]
+                shares = num.minimum(shares, share[tuple(index)])
+            volumes = num.broadcast_to(markets[-1][1], shape)
+            # Combinations of the very same prices are derived once
+            paths = []
+            unique = []
+            for i, edges in enumerate(itertools.product(*[x[3] for x in markets])):
+                edges = sum(edges, ())
+                if edges not in seen:
+                    seen.add(edges)
+                    paths.append(edges)
+                    unique.append(i)
+            routes.append(Route(
+                path,
+                num.exp(log_prices).ravel()[unique],
+                volumes.ravel()[unique],
+                shares.ravel()[unique] / len(markets),
+                paths))
+
+        if self.max_routes and sum(len(x.prices) for x in routes) > self.max_routes:
+            qualities = num.concatenate([x.quality for x in routes])
+            threshold = num.sort(qualities)[-self.max_routes]
+            budget = self.max_routes - int((qualities > threshold).sum())
+            for route in routes:
+                keep = route.quality > threshold
+                ties = num.flatnonzero(route.quality == threshold)[:max(0, budget)]
+                keep[ties] = True
+                budget -= len(ties)
+                route.prices = route.prices[keep]
+                route.volumes = route.volumes[keep]
+                route.quality = route.quality[keep]
+                route.paths = [x for x, k in zip(route.paths, keep) if k]
+        return [x for x in routes if len(x.prices)]
+
+
+def changed_markets(old, new):
+    """ Markets ``(base, quote)`` whose prices differ between two feeds
+        of a source, as read by :class:`PriceGraph`
+    """
+    old = dict(((base, quote), x) for base, quote, *x in PriceGraph.extract_edges(None, old or {}))
+    new = dict(((base, quote), x) for base, quote, *x in PriceGraph.extract_edges(None, new or {}))
+    return set(market for market in set(old) | set(new) if old.get(market) != new.get(market))
+
+
+class DependencyIndex(object):
+    """ Assets whose derived prices depend on the markets of each source
+
+        An asset derived from the sources ``datasources`` through routes
+        visiting ``symbols`` (see :class:`RouteFinder`) depends on every
+        market of these sources with one of these symbols. When such a
+        market changes the asset is marked dirty, the derived prices of
+        the other assets are still valid.
+    """
+    def __init__(self):
+        self.assets = {}
+        self.index = {}
+        self.dirty = set()
+
+    def record(self, asset, datasources, symbols):
+        """ Record the dependencies of freshly derived prices of ``asset``
+        """
+        self.forget(asset)
+        keys = set((datasource, symbol) for datasource in datasources for symbol in symbols)
+        for key in keys:
+            self.index.setdefault(key, set()).add(asset)
+        self.assets[asset] = keys
+
+    def forget(self, asset):
+        for key in self.assets.pop(asset, ()):
+            self.index[key].discard(asset)
+        self.dirty.discard(asset)
+
+    def invalidate(self, datasource, markets):
+        """ Mark the assets depending on ``markets`` of ``datasource``
+            dirty, returns them
+        """
+        assets = set()
+        for base, quote in markets:
+            assets |= self.index.get((datasource, base), set())
+            assets |= self.index.get((datasource, quote), set())
+        self.dirty |= assets
+        return assets
+
+    def is_clean(self, asset):
+        """ Are the recorded prices of ``asset`` still valid?
+        """
+        return asset in self.assets and asset not in self.dirty
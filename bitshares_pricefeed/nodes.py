@@ -0,0 +1,178 @@
+import functools
+import itertools
+import threading
+import time
+from concurrent import futures
+from datetime import datetime, timezone
+
+from bitsharesapi.bitsharesnoderpc import BitSharesNodeRPC
+from grapheneapi.exceptions import RPCError
+
+import logging
+log = logging.getLogger(__name__)
+
+# Calls always sent to the best node
+BROADCASTS = (
+    "broadcast_transaction",
+    "broadcast_transaction_synchronous",
+    "broadcast_transaction_with_callback",
+)
+
+
+class Node(object):
+    """ A node of a :class:`NodePool` and its last measurements
+    """
+    def __init__(self, url):
+        self.url = url
+        self.rpc = None
+        self.latency = None
+        self.lag = None
+        self.healthy = False
+        self.error = None
+        self.lock = threading.Lock()
+
+    def connect(self):
+        with self.lock:
+            if self.rpc is None:
+                # Failing over is up to the pool, do not retry here
+                self.rpc = BitSharesNodeRPC(self.url, num_retries=0)
+            return self.rpc
+
+    def disconnect(self):
+        if self.rpc is not None:
+            try:
+                self.rpc.connection.disconnect()
+            except Exception:
+                pass
+            self.rpc = None
+
+    def probe(self, max_lag):
+        """ Measure the round trip of a call and how far the node's head
+            block is behind
+        """
+        try:
+            rpc = self.connect()
+            start = time.monotonic()
+            properties = rpc.get_dynamic_global_properties()
+            self.latency = time.monotonic() - start
+            head = datetime.strptime(properties["time"], "%Y-%m-%dT%H:%M:%S").replace(tzinfo=timezone.utc)
+            self.lag = (datetime.now(timezone.utc) - head).total_seconds()
+            self.healthy = self.lag <= max_lag
+            self.error = None if self.healthy else "head block %ds old" % self.lag
+        except Exception as e:
+            self.failed(e)
+        return self
+
+    def failed(self, error):
+        self.healthy = False
+        self.error = str(error) or type(error).__name__
+        self.disconnect()
+
+    def __repr__(self):
+        return "<Node %s %s>" % (self.url, "healthy" if self.healthy else self.error)
+
+
+class NodePool(object):
+    """ Several API nodes used as one, in place of ``BitShares.rpc``
+
+        All nodes are probed when the pool is created and again every
+        ``probe_interval`` seconds: the round trip of a call and the age
+        of the node's head block are measured. Nodes lagging more than
+        ``max_lag`` seconds, or failing, are unhealthy.
+
+        Calls go to the healthy node with the lowest latency. A call
+        failing on a node (connection lost, timeout, ...) is retried on
+        the next one; errors returned by the node itself
+        (:class:`grapheneapi.exceptions.RPCError`) are raised as is. With
+        ``spread_reads``, reads are spread over all healthy nodes, while
+        broadcasts always go to the best node.
+
+        :param list urls: websocket endpoints of the nodes
+        :param float probe_interval: seconds between two probes
+        :param float max_lag: seconds the head block of a healthy node may
+            be behind
+        :param bool spread_reads: spread reads over the healthy nodes
+    """
+    def __init__(self, urls, probe_interval=300, max_lag=60, spread_reads=False):
+        if isinstance(urls, str):
+            urls = [urls]
+        if not urls:
+            raise ValueError("A node pool needs at least one node")
+        self.nodes = [Node(url) for url in urls]
+        self.probe_interval = probe_interval
+        self.max_lag = max_lag
+        self.spread_reads = spread_reads
+        self.lock = threading.Lock()
+        self.turn = itertools.count()
+        self.probed = 0
+        self.probe()
+
+    def probe(self):
+        """ Probe all nodes concurrently
+        """
+        self.probed = time.time()
+        with futures.ThreadPoolExecutor(max_workers=len(self.nodes)) as pool:
+            list(pool.map(lambda node: node.probe(self.max_lag), self.nodes))
+        for node in self.ranked():
+            log.info("Node %s: latency %s, lag %s, %s", node.url, node.latency, node.lag,
+                     "healthy" if node.healthy else node.error)
+
+    def ranked(self):
+        """ The nodes, best first: healthy ones by latency, then the
+            others
+        """
+        return sorted(self.nodes, key=lambda node: (
+            not node.healthy,
+            node.latency if node.latency is not None else float("inf")))
+
+    @property
+    def urls(self):
+        return [node.url for node in self.ranked()]
+
+    def best(self):
+        return self.ranked()[0]
+
+    def candidates(self, name):
+        """ The nodes to try for a call of ``name``, in order
+        """
+        if time.time() - self.probed > self.probe_interval:
+            with self.lock:
+                if time.time() - self.probed > self.probe_interval:
+                    self.probe()
+        nodes = self.ranked()
+        healthy = [node for node in nodes if node.healthy]
+        if self.spread_reads and name not in BROADCASTS and len(healthy) > 1:
+            first = next(self.turn) % len(healthy)
+            nodes = healthy[first:] + healthy[:first] + nodes[len(healthy):]
+        return nodes
+
+    @property
+    def url(self):
+        return self.best().url
+
+    def call(self, name, *args, **kwargs):
+        return self.run(name, lambda rpc: getattr(rpc, name)(*args, **kwargs))
+
+    def run(self, name, action):
+        """ Run ``action`` on the connection of the first node it does not
+            fail on
+        """
+        error = None
+        for node in self.candidates(name):
+            try:
+                return action(node.connect())
+            except RPCError:
+                raise
+            except Exception as e:
+                log.warning("%s failed on %s (%s), failing over", name, node.url, e)
+                node.failed(e)
+                error = e
+        raise error
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        if isinstance(getattr(BitSharesNodeRPC, name, None), property):
+            # e.g. chain_params
+            return self.run(name, lambda rpc: getattr(rpc, name))
+        return functools.partial(self.call, name)
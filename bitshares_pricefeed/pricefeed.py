@@ -1,10 +1,9 @@
-import statistics
+import multiprocessing
 import numpy as num
-import psycopg2
 import time
 import json
 import os.path
-from math import fabs, sqrt
+from math import fabs
 from bitshares import BitShares
 from bitshares.instance import shared_bitshares_instance
 from bitshares.account import Account
@@ -15,28 +14,43 @@ from bitshares.market import Market
 from bitshares.witness import Witness
 from bitshares.exceptions import AccountDoesNotExistsException
 from datetime import datetime, date, timezone, timedelta
-from dateutil.parser import parse
 from . import sources
+from .chain import ChainSnapshot
+from .graph import (
+    DependencyIndex, PriceGraph, PriceStore, RouteFinder, changed_markets, get_source_description)
+from .stats import METRICS, summarize, weighted_std
 import logging
 log = logging.getLogger(__name__)
 
 # logging.basicConfig(level=logging.INFO)
 
 
-def weighted_std(values, weights):
-    """ Weighted std for statistical reasons
-    """
-    average = num.average(values, weights=weights)
-    variance = num.average((values - average) ** 2, weights=weights)  # Fast and numerically precise
-    return sqrt(variance)
-
-
 class Feed(object):
     feed = {}
     price_result = {}
 
+    # Exchanges whose feeds the target price algorithms read directly,
+    # see compute_target_price
+    target_price_exchanges = {
+        "gugublack": ["bitshares"],
+        "gugu": ["magicwallet", "bitshares"],
+        "guguusd": ["sina", "bitshares"],
+    }
+
     def __init__(self, config):
         self.config = config
+        self.http = sources.HttpClient(**self.config.get("http", {}))
+        self.cache = sources.SourceCache(**self.config.get("cache", {}))
+        self.limiter = sources.RateLimiter(self.config.get("quota_file"))
+        self.health = sources.HealthRegistry(**self.config.get("health", {}))
+        self.tickers = sources.TickerService(
+            index=sources.MarketIndex(**self.config.get("market_index", {})),
+            **self.config.get("tickers", {}))
+        self.late_sources = []
+        self.graph = None
+        self.snapshot = None
+        self.derived = {}
+        self.dependencies = DependencyIndex()
         self.reset()
         self.get_witness_activeness()
         self.getProducer()
@@ -60,37 +74,49 @@ class Feed(object):
         """ Reset all for-processing variables
         """
         # Do not reset feeds here!
-        self.data = {}
-        for base in self.config["assets"]:
-            self.data[base] = {}
-            for quote in self.config["assets"]:
-                self.data[base][quote] = []
+        self.data = PriceStore()
 
-    def get_my_current_feed(self, asset):
+    def new_run(self):
+        """ Start a new run: the chain state and the DEX tickers are read
+            again
+        """
+        self.snapshot = None
+        self.tickers.reset()
+
+    def get_snapshot(self):
+        """ The chain state of this run, see :class:`ChainSnapshot`
+        """
+        if self.snapshot is None:
+            self.snapshot = ChainSnapshot(producer=self.producer["id"])
+        return self.snapshot
+
+    def take_snapshot(self, symbols):
+        """ Load the chain state of the assets ``symbols`` not loaded yet
+            (e.g. by sources reading the chain) at once
+        """
+        self.get_snapshot().load(symbols)
+
+    def get_my_current_feed(self, symbol):
         """ Obtain my own price feed for an asset
         """
-        feeds = asset.feeds
-        for feed in feeds:
-            if feed["producer"]["id"] == self.producer["id"]:
-                return feed
+        return self.get_snapshot().current_feed(symbol)
 
     def obtain_price_change(self, symbol):
         """ Store the price change to your previous feed
         """
-        asset = Asset(symbol, full=True)
         price = self.price_result.get(symbol, None)
         # if not price:
         #     raise ValueError("Price for %s has not yet been derived" % symbol)
         newPrice = price["price"]
         # get my current feed
-        current_feed = self.get_my_current_feed(asset)
+        current_feed = self.get_my_current_feed(symbol)
         if current_feed and "settlement_price" in current_feed:
             oldPrice = float(current_feed["settlement_price"])
         else:
             oldPrice = float("inf")
         self.price_result[symbol]["priceChange"] = (oldPrice - newPrice) / newPrice * 100.0
         self.price_result[symbol]["current_feed"] = current_feed
-        self.price_result[symbol]["global_feed"] = asset.feed
+        self.price_result[symbol]["global_feed"] = self.get_snapshot().global_feed(symbol)
 
     def obtain_flags(self, symbol):
         """ This will add attributes to price_result and indicate the results
@@ -128,7 +154,7 @@ class Feed(object):
                 raise ValueError(
                     "Missing one of required settings for cer: {}".format(
                         str(required)))
-            ticker = Market(cer["ref_ticker"]).ticker()
+            ticker = self.tickers.ticker(cer["ref_ticker"])
             price = ticker[cer["ref_ticker_attribute"]]
             price *= cer["factor"]
             orientation = Market(cer["orientation"])
@@ -152,12 +178,97 @@ class Feed(object):
             sources = list(self.config["exchanges"].keys())
         return sources
 
-    def fetch(self):
+    def route_hops(self, symbol):
+        """ Maximum number of markets in the routes of an asset
+        """
+        max_hops = self.assetconf(symbol, "max_hops", no_fail=True)
+        if max_hops is None:
+            max_hops = 3 if self.assetconf(symbol, "derive_across_3markets", no_fail=True) else 2
+        return max_hops
+
+    def select_exchanges(self, symbols):
+        """ Names of the exchanges the prices of ``symbols`` can be
+            derived from
+
+            These are the sources of the assets. Sources with configured
+            ``bases`` and ``quotes`` are only kept if one of their markets
+            can be on a route: between the asset (or its smartcoin for
+            BSIP42), its backing asset and the intermediate assets, two
+            intermediate assets only for routes of more than 2 markets.
+            The exchanges the asset's ``target_price_algorithm`` reads are
+            always kept.
+        """
+        exchanges = self.config["exchanges"]
+        intermediates = set(self.config.get("intermediate_assets") or [])
+        self.take_snapshot(symbols)
+        names = set()
+        for symbol in symbols:
+            asset = self.get_backing_asset(symbol)
+            ends = set([symbol, "BIT" + symbol])
+            if asset:
+                ends.add(asset["short_backing_asset"]["symbol"])
+            reachable = ends | intermediates
+            hops = self.route_hops(symbol)
+            algorithm = self.assetconf(symbol, "target_price_algorithm", no_fail=True)
+            names.update(
+                name for name in self.target_price_exchanges.get(algorithm, []) if name in exchanges)
+            for name in self.get_sources(symbol):
+                if name in names or name not in exchanges:
+                    continue
+                exchange = exchanges[name]
+                if "enable" in exchange and not exchange["enable"]:
+                    continue
+                if not asset or not sources.load_source(exchange["klass"]).pair_scoped:
+                    names.add(name)
+                    continue
+                aliases = exchange.get("aliases") or {}
+                for base in exchange.get("bases") or []:
+                    for quote in exchange.get("quotes") or []:
+                        pair = set([aliases.get(base, base), aliases.get(quote, quote)])
+                        if pair <= reachable and (pair & ends or hops > 2):
+                            names.add(name)
+        return sorted(names)
+
+    def fetch(self, names=None, assets=None):
         """ Fetch the prices from external exchanges
+
+            Only the exchanges ``names`` are fetched if given, the feeds of
+            the others are kept from previous fetches. With ``assets``,
+            only the exchanges their prices can be derived from are
+            fetched (see :meth:`select_exchanges`).
         """
         if "exchanges" not in self.config or not self.config["exchanges"]:
             return
-        self.feed.update(sources.fetch_all(self.config["exchanges"]))
+        # A new run, sources reading the chain fill a new snapshot
+        self.new_run()
+        exchanges = self.config["exchanges"]
+        if assets:
+            selected = self.select_exchanges(assets)
+            log.info("Fetching {} of {} exchanges".format(len(selected), len(exchanges)))
+            names = [x for x in names if x in selected] if names is not None else selected
+        if names is not None:
+            exchanges = dict((name, exchanges[name]) for name in names)
+        engine = sources.FetchEngine(
+            max_workers=self.config.get("fetch_workers", 32),
+            http=self.http,
+            deadline=self.config.get("fetch_deadline"),
+            cache=self.cache,
+            limiter=self.limiter,
+            health=self.health,
+            tickers=self.tickers,
+            snapshot=self.get_snapshot(),
+            priority=set(self.config["assets"]) | set(self.config.get("intermediate_assets") or []))
+        self.update_feeds(engine.run(exchanges))
+        self.late_sources = engine.late
+
+    def update_feeds(self, feeds):
+        """ Replace the feeds of some sources, the assets depending on
+            their changed markets will be derived again
+        """
+        for name, data in feeds.items():
+            self.dependencies.invalidate(name, changed_markets(self.feed.get(name), data))
+        self.feed.update(feeds)
+        self.graph = None
 
     def assethasconf(self, symbol, parameter):
         """ Do we have symbol specific parameters?
@@ -190,144 +301,55 @@ class Feed(object):
         """
         log.info("addPrice(self, {}, {}, {}, {} (sources: {}))".format(
             base, quote, price, volume, str(sources)))
-        if base not in self.data:
-            self.data[base] = {}
-        if quote not in self.data[base]:
-            self.data[base][quote] = []
-
         flat_list = []
         for source in sources:
-            if isinstance(source, list):
+            if isinstance(source, (list, tuple)):
                 for item in source:
                     flat_list.append(item)
             else:
                 flat_list.append(source)
-
-        self.data[base][quote].append(dict(
-            price=price,
-            volume=volume,
-            sources=flat_list
-        ))
+        self.data.add(base, quote, price, volume, flat_list)
 
     def get_source_description(self, datasource, base, quote, data):
-        return '{} - {}:{}'.format(data['source'] if 'source' in data else datasource, base, quote)
+        return get_source_description(datasource, base, quote, data)
 
     def appendOriginalPrices(self, symbol):
         """ Load feed data into price/volume array for processing
-            This few lines solely take the data of the chosen exchanges and put
-            them into price[base][quote]. Since markets are symmetric, the
-            corresponding price[quote][base] is derived accordingly and the
-            corresponding volume is derived at spot price
+            The prices of the chosen exchanges, original and inverted, are
+            taken from the price graph built once per run (see
+            :class:`PriceGraph`). Derived prices are added to a store on
+            top of the graph's, which is shared between assets.
         """
         if "exchanges" not in self.config or not self.config["exchanges"]:
             return
 
-        for datasource in self.get_sources(symbol):
-            if not self.config["exchanges"][datasource].get("enable", True):
-                log.info('Skip disabled source {}'.format(datasource))
-                continue
-            log.info("appendOriginalPrices({}) from {}".format(symbol, datasource))
-            if datasource not in self.feed:
-                continue
-            for base in list(self.feed[datasource]):
-                if base == "response":  # skip entries that store debug data
-                    continue
-                for quote in list(self.feed[datasource][base]):
-                    if quote == "response":  # skip entries that store debug data
-                        continue
-                    if not base or not quote:
-                        continue
-
-                    feed_data = self.feed[datasource][base][quote]
-                    # Skip markets with zero trades in the last 24h
-                    if feed_data["volume"] == 0.0:
-                        continue
-
-                    # Original price/volume
-                    self.addPrice(
-                        base,
-                        quote,
-                        feed_data["price"],
-                        feed_data["volume"],
-                        sources=[self.get_source_description(datasource, base, quote, feed_data)]
-                    )
-
-                    if feed_data["price"] > 0 and feed_data["volume"] > 0:
-                        # Inverted pair price/volume
-                        self.addPrice(
-                            quote,
-                            base,
-                            float(1.0 / feed_data["price"]),
-                            float(feed_data["volume"] * feed_data["price"]),
-                            sources=[self.get_source_description(datasource, quote, base, feed_data)]
-                        )
-
-    def derive2Markets(self, base_symbol, target_symbol):
-        """ derive BTS prices for all assets in assets_derive
-            This loop adds prices going via 2 markets:
+        if self.graph is None:
+            self.graph = PriceGraph(self.feed, self.config["exchanges"])
+        self.data = PriceStore(parent=self.graph.view(self.get_sources(symbol)))
+
+    def derive_routes(self, base_symbol, target_symbol, max_hops=None):
+        """ derive prices of base_symbol:target_symbol going via several
+            markets, through intermediate_assets:
             E.g.: CNY:BTC -> BTC:BTS = CNY:BTS
-            I.e.: BTS: interasset -> interasset: targetasset
-        """
-        for interasset in self.config.get("intermediate_assets", []):
-            if interasset == base_symbol:
-                continue
-            if interasset not in self.data[base_symbol]:
-                continue
-            for ratio in self.data[base_symbol][interasset]:
-                if interasset in self.data and target_symbol in self.data[interasset]:
-                    for idx in range(0, len(self.data[interasset][target_symbol])):
-                        if self.data[interasset][target_symbol][idx]["volume"] == 0:
-                            continue
-                        self.addPrice(
-                            base_symbol,
-                            target_symbol,
-                            float(self.data[interasset][target_symbol][idx]["price"] * ratio["price"]),
-                            float(self.data[interasset][target_symbol][idx]["volume"]),
-                            sources=[
-                                ratio["sources"],
-                                self.data[interasset][target_symbol][idx]["sources"]
-                            ]
-                        )
-
-    def derive3Markets(self, base_symbol, target_symbol):
-        """ derive BTS prices for all assets in assets_derive
-            This loop adds prices going via 3 markets:
             E.g.: GOLD:USD -> USD:BTC -> BTC:BTS = GOLD:BTS
-            I.e.: BTS: interassetA -> interassetA: interassetB -> symbol: interassetB
-        """
-        if "intermediate_assets" not in self.config or not self.config["intermediate_assets"]:
-            return
+            Up to max_hops markets are chained (2 by default, 3 with
+            derive_across_3markets), see :class:`RouteFinder`.
 
-        if self.assetconf(base_symbol, "derive_across_3markets"):
-            for interassetA in self.config["intermediate_assets"]:
-                for interassetB in self.config["intermediate_assets"]:
-                    if interassetB == base_symbol or interassetA == base_symbol or interassetA == interassetB:
-                        continue
-                    if interassetA not in self.data[interassetB] or interassetB not in self.data[base_symbol]:
-                        continue
-
-                    for ratioA in self.data[interassetB][interassetA]:
-                        for ratioB in self.data[base_symbol][interassetB]:
-                            if (
-                                interassetA not in self.data or
-                                target_symbol not in self.data[interassetA]
-                            ):
-                                continue
-                            for idx in range(0, len(self.data[interassetA][target_symbol])):
-                                if self.data[interassetA][target_symbol][idx]["volume"] == 0:
-                                    continue
-                                log.info("derive_across_3markets - found %s -> %s -> %s -> %s", base_symbol, interassetB, interassetA, target_symbol)
-                                self.addPrice(
-                                    base_symbol,
-                                    target_symbol,
-                                    float(self.data[interassetA][target_symbol][idx]["price"] * ratioA["price"] * ratioB["price"]),
-                                    float(self.data[interassetA][target_symbol][idx]["volume"]),
-                                    sources=[
-                                        ratioB["sources"],
-                                        ratioA["sources"],
-                                        self.data[interassetA][target_symbol][idx]["sources"]
-                                    ]
-                                )
+            Returns the symbols whose markets the routes were looked for in.
+        """
+        if max_hops is None:
+            max_hops = self.route_hops(base_symbol)
+        finder = RouteFinder(
+            self.data,
+            self.config.get("intermediate_assets") or [],
+            max_hops=max_hops,
+            min_volume=self.assetconf(base_symbol, "route_min_volume", no_fail=True),
+            fan_out=self.assetconf(base_symbol, "route_fan_out", no_fail=True),
+            max_routes=self.assetconf(base_symbol, "max_routes", no_fail=True))
+        for route in finder.routes(base_symbol, target_symbol):
+            log.info("derive_routes - found %s", " -> ".join(route.symbols))
+            self.data.add_many(base_symbol, target_symbol, route.prices, route.volumes, route.paths)
+        return finder.visited
 
     def get_premium_details(self, smartcoin_symbol, realcoin_symbol, dex_price):
         details = {
@@ -335,9 +357,9 @@ class Feed(object):
         }
 
         if smartcoin_symbol in self.data:
-            self.derive2Markets(smartcoin_symbol, realcoin_symbol)
-            if realcoin_symbol in self.data[smartcoin_symbol]:
-                details['alternative'] = self.data[smartcoin_symbol][realcoin_symbol]
+            self.derive_routes(smartcoin_symbol, realcoin_symbol, max_hops=2)
+            if realcoin_symbol in self.data.quotes(smartcoin_symbol):
+                details['alternative'] = self.data.entries(smartcoin_symbol, realcoin_symbol)
         
         return details
 
@@ -352,10 +374,20 @@ class Feed(object):
         with open(historic_file, 'w') as outfile:
             json.dump({'premium': premium, 'i': i}, outfile)
     
+    def connect_database(self):
+        """ Connect to the database of the gugu target price algorithms,
+            the only users of psycopg2
+        """
+        import psycopg2
+        database = self.config["database"]
+        return psycopg2.connect(
+            database=database["dbname"], user=database["dbuser"], password=database["dbpwd"],
+            host=database["dbhost"], port=database["dbport"])
+
     # Cf BSIP-42: https://github.com/bitshares/bsips/blob/master/bsip-0042.md
     def compute_target_price(self, symbol, backing_symbol, real_price):
         
-        ticker = Market("%s:%s" % (backing_symbol, symbol)).ticker()
+        ticker = self.tickers.ticker("%s:%s" % (backing_symbol, symbol))
         dex_price = float(ticker["latest"])
         settlement_price = float(ticker['baseSettlement_price'])
         premium = (real_price / dex_price) - 1
@@ -411,11 +443,11 @@ class Feed(object):
             
             print("\033[1;31;40m当前价格%s\033[0m" % str(1/float(self.feed["bitshares"]["BTS"]["CNY"]["price"])))
             print("计算C")
-            market = Market("BTS:CNY")
-            c=market.ticker()['baseSettlement_price']/market.ticker()['latest']
+            ticker = self.tickers.ticker("BTS:CNY")
+            c=ticker['baseSettlement_price']/ticker['latest']
             print("\033[1;31;40m 当前C%s\033[0m" %  str(c))
             print("获取数据库数据")
-            conn = psycopg2.connect(database=self.config["database"]["dbname"], user=self.config["database"]["dbuser"], password=self.config["database"]["dbpwd"], host=self.config["database"]["dbhost"], port=self.config["database"]["dbport"])
+            conn = self.connect_database()
             CNY=1/float(self.feed["bitshares"]["BTS"]["CNY"]["price"])
             
             mrate_old=0
@@ -511,7 +543,7 @@ class Feed(object):
                 CNY=saveprice
             print("\033[1;31;40m最终CNY喂价%s\033[0m" %  str(CNY))
             sqlinsert="INSERT INTO record (btsprice, feedprice, cvalue,mrate,myfeedprice) \
-            VALUES ('"+str(market.ticker()['latest'])+"','"+str(market.ticker()['baseSettlement_price'])+"','"+str(market.ticker()['baseSettlement_price']/market.ticker()['latest'])+"','"+str(mrate)+"','"+str(CNY)+"')"
+            VALUES ('"+str(ticker['latest'])+"','"+str(ticker['baseSettlement_price'])+"','"+str(ticker['baseSettlement_price']/ticker['latest'])+"','"+str(mrate)+"','"+str(CNY)+"')"
             #print('timedis')
             #print((parse(time.strftime('%Y-%m-%d %H:%M:%S',time.localtime()))- parse(cdatetime)).total_seconds()/(60*60))
             #if self.config["changehour"]<((parse(time.strftime('%Y-%m-%d %H:%M:%S',time.localtime()))- parse(cdatetime)).total_seconds()/(60*60)):
@@ -523,13 +555,13 @@ class Feed(object):
             adjusted_price=CNY
         elif target_price_algorithm=="guguusd":
             print("\033[1;32;40mmagicwallet for USD\033[0m")
-            market1 = Market("BTS:USD")
-            c=market1.ticker()['baseSettlement_price']/market1.ticker()['latest']
+            ticker1 = self.tickers.ticker("BTS:USD")
+            c=ticker1['baseSettlement_price']/ticker1['latest']
             print("\033[1;32;40m 当前C%s\033[0m" %  str(c))
 
             #get now rate
-            market = Market("BTS:CNY")
-            c2=float(str(market1.ticker()["latest"]).split(' ')[0])/float(str(market.ticker()["latest"]).split(' ')[0])
+            ticker = self.tickers.ticker("BTS:CNY")
+            c2=float(str(ticker1["latest"]).split(' ')[0])/float(str(ticker["latest"]).split(' ')[0])
  
             print("\033[1;32;40m 当前bitsharesUSDrate%s\033[0m" %  str(c2)) 
             c_new=self.feed["sina"]["USD"]["CNY"]["price"]
@@ -537,7 +569,7 @@ class Feed(object):
             usdrate=c_new/c2
             print("\033[1;33;40m 当前C%s\033[0m" %  str(usdrate))
             print("\033[1;32;40m获取数据库数据\033[0m")
-            conn = psycopg2.connect(database=self.config["database"]["dbname"], user=self.config["database"]["dbuser"], password=self.config["database"]["dbpwd"], host=self.config["database"]["dbhost"], port=self.config["database"]["dbport"])
+            conn = self.connect_database()
             usdrate_old=0
             
             cur_mrate = conn.cursor()
@@ -620,7 +652,7 @@ class Feed(object):
             USD=USD*c
             print("\033[1;32;40m最终USD's feedprice%s\033[0m" % str(USD))
             sqlinsert="INSERT INTO recordusd (btsprice, feedprice, cvalue,mrate,myfeedprice) \
-            VALUES ('"+str(market1.ticker()['latest'])+"','"+str(market1.ticker()['baseSettlement_price'])+"','"+str(market1.ticker()['baseSettlement_price']/market1.ticker()['latest'])+"','"+str(usdrate)+"','"+str(USD)+"')"
+            VALUES ('"+str(ticker1['latest'])+"','"+str(ticker1['baseSettlement_price'])+"','"+str(ticker1['baseSettlement_price']/ticker1['latest'])+"','"+str(usdrate)+"','"+str(USD)+"')"
             
             cur.execute(sqlinsert)
             conn.commit()
@@ -635,57 +667,115 @@ class Feed(object):
 
 
 
-    def derive_asset(self, symbol):
-        """ Derive prices for an asset by adding data from the
-            exchanges to the internal state and processing through markets
+    def get_backing_asset(self, symbol):
+        """ A bitasset, with its short backing asset, from the chain
+            snapshot. Returns None for assets that are not bitassets.
         """
-        asset = Asset(symbol, full=True)
+        asset = self.get_snapshot().asset(symbol)
         if not asset.is_bitasset:
             return
-        short_backing_asset = Asset(asset["bitasset_data"]["options"]["short_backing_asset"])
-        backing_symbol = short_backing_asset["symbol"]
-        asset["short_backing_asset"] = short_backing_asset
+        return asset
 
+    def prefetch_tickers(self, symbols):
+        """ Fetch the DEX tickers needed for the target prices and core
+            exchange rates of ``symbols`` at once, see
+            :class:`sources.TickerService`
+        """
+        markets = []
+        for symbol in symbols:
+            asset = self.get_backing_asset(symbol)
+            if not asset:
+                continue
+            markets.append("%s:%s" % (asset["short_backing_asset"]["symbol"], symbol))
+            cer = self.assetconf(symbol, "core_exchange_rate", no_fail=True)
+            if cer and "ref_ticker" in cer:
+                markets.append(cer["ref_ticker"])
+            algorithm = self.assetconf(symbol, "target_price_algorithm", no_fail=True)
+            if algorithm == "gugu":
+                markets.append("BTS:CNY")
+            elif algorithm == "guguusd":
+                markets.extend(["BTS:USD", "BTS:CNY"])
+        self.tickers.prefetch(markets)
+
+    def derive_prices(self, symbol, backing_symbol):
+        """ Derive the statistics of the prices of symbol:backing_symbol
+            by processing the exchanges' prices through markets. The
+            prices are left in self.data, None is returned if there are
+            none.
+
+            The statistics include the ``symbols`` the prices depend on
+            the markets of, see :class:`DependencyIndex`.
+        """
         # Reset self.data
         self.reset()
 
         # Fill in self.data
         self.appendOriginalPrices(symbol)
-        log.info("Computed data (raw): \n{}".format(self.data))
-        self.derive2Markets(symbol, backing_symbol)
-        self.derive3Markets(symbol, backing_symbol)
-        log.info("Computed data (after derivation): \n{}".format(self.data))
+        symbols = self.derive_routes(symbol, backing_symbol)
 
         if symbol not in self.data:
             log.warn("'{}' not in self.data".format(symbol))
             return
-        if backing_symbol not in self.data[symbol]:
+        if backing_symbol not in self.data.quotes(symbol):
             log.warn("'backing_symbol' ({}) not in self.data[{}]".format(backing_symbol, symbol))
             return
-        assetvolume = [v["volume"] for v in self.data[symbol][backing_symbol]]
-        assetprice = [p["price"] for p in self.data[symbol][backing_symbol]]
-
-        if len(assetvolume) > 1:
-            price_median = statistics.median([x["price"] for x in self.data[symbol][backing_symbol]])
-            price_mean = statistics.mean([x["price"] for x in self.data[symbol][backing_symbol]])
-            price_weighted = num.average(assetprice, weights=assetvolume)
-            price_std = weighted_std(assetprice, assetvolume)
-        elif len(assetvolume) == 1:
-            price_median = assetprice[0]
-            price_mean = assetprice[0]
-            price_weighted = assetprice[0]
-            price_std = 0
-        else:
+        trim = self.assetconf(symbol, "trim", no_fail=True)
+        stats = summarize(
+            self.data.prices(symbol, backing_symbol),
+            self.data.volumes(symbol, backing_symbol),
+            trim=0.1 if trim is None else trim,
+            outlier_threshold=self.assetconf(symbol, "outlier_threshold", no_fail=True))
+        if not stats:
             print("[Warning] No market route found for %s. Skipping price" % symbol)
             return
+        if stats["rejected"]:
+            log.info("Rejected {} outlier prices of {}".format(stats["rejected"], symbol))
+        stats["symbols"] = symbols
+        return stats
+
+    def restore_prices(self, symbol, backing_symbol, derived):
+        """ Rebuild the prices of an asset in self.data from the prices
+            derived through routes, as ``(prices, volumes, paths)``
+        """
+        self.reset()
+        self.appendOriginalPrices(symbol)
+        self.data.add_many(symbol, backing_symbol, *derived)
+
+    def remember(self, symbol, backing_symbol, stats):
+        """ Keep the prices of an asset derived in self.data, they are
+            reused by :meth:`derive` until the markets they depend on change
+        """
+        rows = self.data.own_slice(symbol, backing_symbol)
+        # Paths are kept as descriptions, edge ids only hold in this run's graph
+        self.derived[symbol] = (backing_symbol, stats, (
+            self.data.price[rows],
+            self.data.volume[rows],
+            [tuple(self.data.provenance.describe(x)) for x in self.data.path[rows].tolist()]))
+        self.dependencies.record(symbol, self.get_sources(symbol), stats["symbols"])
+
+    def derive_asset(self, symbol, asset=None, stats=None):
+        """ Derive prices for an asset by adding data from the
+            exchanges to the internal state and processing through markets
+
+            ``asset`` (see :meth:`get_backing_asset`) and ``stats`` (see
+            :meth:`derive_prices`, with self.data holding the prices) can
+            be given when already obtained, e.g. by :meth:`derive_parallel`.
+        """
+        if asset is None:
+            asset = self.get_backing_asset(symbol)
+            if not asset:
+                return
+        backing_symbol = asset["short_backing_asset"]["symbol"]
+
+        if stats is None:
+            stats = self.derive_prices(symbol, backing_symbol)
+            if not stats:
+                return
+            self.remember(symbol, backing_symbol, stats)
 
         metric = self.assetconf(symbol, "metric")
-        if metric == "median":
-            p = price_median
-        elif metric == "mean":
-            p = price_mean
-        elif metric == "weighted":
-            p = price_weighted
+        if metric in METRICS:
+            p = stats[metric]
         else:
             raise ValueError("Asset %s has an unknown metric '%s'" % (
                 symbol,
@@ -701,11 +791,12 @@ class Feed(object):
             "price": target_price,
             "unadjusted_price": p,
             "cer": cer,
-            "mean": price_mean,
-            "median": price_median,
-            "weighted": price_weighted,
-            "std": price_std * 100,  # percentage
-            "number": len(assetprice),
+            "mean": stats["mean"],
+            "median": stats["median"],
+            "weighted": stats["weighted"],
+            "std": stats["std"] * 100,  # percentage
+            "number": stats["number"],
+            "rejected": stats["rejected"],
             "premium": premium * 100, # percentage
             "short_backing_symbol": backing_symbol,
             "mssr": self.assetconf(symbol, "maximum_short_squeeze_ratio"),
@@ -714,30 +805,126 @@ class Feed(object):
             "premium_details": details
         }
 
+    def derive_parallel(self, symbols, workers):
+        """ Derive prices of several assets in parallel: price derivation
+            (routes and statistics) of each asset runs on a pool of
+            ``workers`` processes. The price graph is handed to each
+            process once, when it starts.
+
+            Results are merged back in the order of ``symbols``. Target
+            prices, which may query the chain and a database, are then
+            computed one asset after the other.
+        """
+        assets = dict((symbol, self.get_backing_asset(symbol)) for symbol in symbols)
+        tasks = [
+            (symbol, assets[symbol]["short_backing_asset"]["symbol"])
+            for symbol in symbols if assets[symbol]]
+        pool = multiprocessing.Pool(
+            processes=min(workers, len(tasks)) or 1,
+            initializer=_init_derive_worker,
+            initargs=(self.config, self.graph))
+        try:
+            results = pool.map(_derive_worker, tasks)
+        finally:
+            pool.close()
+            pool.join()
+
+        for (symbol, backing_symbol), (stats, derived) in zip(tasks, results):
+            if not stats:
+                continue
+            # Rebuild the prices of the asset from the routes derived
+            self.restore_prices(symbol, backing_symbol, derived)
+            self.remember(symbol, backing_symbol, stats)
+            self.derive_asset(symbol, asset=assets[symbol], stats=stats)
+
+    def reuse_asset(self, symbol):
+        """ Derive the price of an asset from the prices remembered by
+            :meth:`remember`. Returns False if they can not be reused.
+        """
+        if not self.dependencies.is_clean(symbol):
+            return False
+        asset = self.get_backing_asset(symbol)
+        if not asset:
+            return False
+        backing_symbol, stats, derived = self.derived[symbol]
+        if asset["short_backing_asset"]["symbol"] != backing_symbol:
+            return False
+        self.restore_prices(symbol, backing_symbol, derived)
+        self.derive_asset(symbol, asset=asset, stats=stats)
+        return True
+
     def derive(self, assets_derive=set()):
         """ calculate self.feed prices in BTS for all assets given the exchange prices in USD,CNY,BTC,...
+
+            Prices derived through routes are remembered: when the feeds
+            are fetched again, only the assets depending on changed
+            markets are derived again (see :class:`DependencyIndex`).
+            Target prices, core exchange rates and flags are always
+            computed again.
         """
         # Manage default assets to publish
         assets_derive = set(assets_derive)
         if not assets_derive:
             assets_derive = set(self.config["assets"])
+        symbols = sorted(assets_derive)
 
         # create returning dictionary
         self.price_result = {}
-        for symbol in assets_derive:
+        for symbol in symbols:
             self.price_result[symbol] = {}
 
-        for symbol in assets_derive:
-            self.derive_asset(symbol)
+        # All assets read the same prices and chain state, load them once
+        self.graph = PriceGraph(self.feed, self.config.get("exchanges"))
+        self.take_snapshot(symbols)
+        self.prefetch_tickers(symbols)
+        dirty = [symbol for symbol in symbols if not self.reuse_asset(symbol)]
+        if len(dirty) < len(symbols):
+            log.info("Reused the derived prices of {} assets".format(len(symbols) - len(dirty)))
+        workers = self.config.get("derive_workers")
+        if workers and workers > 1 and len(dirty) > 1:
+            self.derive_parallel(dirty, workers)
+        else:
+            for symbol in dirty:
+                self.derive_asset(symbol)
 
         # tests
-        for symbol in assets_derive:
-            if not self.price_result.get(symbol):
-                continue
-            self.obtain_price_change(symbol)
-            self.obtain_flags(symbol)
+        for symbol in symbols:
+            if self.price_result.get(symbol):
+                self.obtain_price_change(symbol)
+                self.obtain_flags(symbol)
+        self.tickers.index.save()
 
         return self.price_result
 
     def get_prices(self):
         return self.price_result
+
+
+# State of the processes of Feed.derive_parallel, set once per process
+_derive_worker_feed = None
+
+
+def _init_derive_worker(config, graph):
+    global _derive_worker_feed
+    # Only the derivation of prices runs here, which needs neither the
+    # chain nor the fetched feeds: skip Feed.__init__
+    _derive_worker_feed = Feed.__new__(Feed)
+    _derive_worker_feed.config = config
+    _derive_worker_feed.graph = graph
+
+
+def _derive_worker(task):
+    """ Derive the price statistics of an asset in a worker process.
+        Returns them with the prices derived through routes, as
+        ``(prices, volumes, paths)``.
+    """
+    symbol, backing_symbol = task
+    feed = _derive_worker_feed
+    stats = feed.derive_prices(symbol, backing_symbol)
+    if not stats:
+        return None, None
+    derived = feed.data
+    return stats, (
+        derived.price[derived.own_slice(symbol, backing_symbol)],
+        derived.volume[derived.own_slice(symbol, backing_symbol)],
+        [derived.provenance.paths[i] for i in derived.path[derived.own_slice(symbol, backing_symbol)].tolist()])
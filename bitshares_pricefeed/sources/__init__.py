@@ -1,37 +1,80 @@
-from .main import FeedSource, _request_headers, fetch_all
-
-# Exchanges
-from .bitcoinaverage import BitcoinAverage
-from .bitcoinvenezuela import BitcoinVenezuela
-from .bittrex import Bittrex
-from .coincap import Coincap
-from .coinmarketcap import Coinmarketcap
-from .currencylayer import CurrencyLayer
-from .fixer import Fixer
-from .graphene import Graphene
-from .huobi import Huobi
-from .indodax import IndoDax
-from .okcoin import Okcoin
-from .openexchangerate import OpenExchangeRates
-from .poloniex import Poloniex, PoloniexVWAP
-from .quandl import Quandl
-from .bitstamp import Bitstamp
-from .aex import Aex
-from .zb import Zb
-from .lbank import Lbank
-from .alphavantage import AlphaVantage
-from .binance import Binance
-from .iex import Iex
-from .worldcoinindex import WorldCoinIndex
-from .coindesk import Coindesk
-from .bitsharesfeed import BitsharesFeed
-from .manual import Manual
-from .coinegg import CoinEgg
-from .composite import Composite
-from .cointiger import CoinTiger
-from .magicwallet import MagicWallet
-from .hertz import Hertz
-from .hero import Hero
-from .sina import Sina
-from .kraken import Kraken
-from .coinbase import Coinbase
+import importlib
+import sys
+import types
+
+from .cache import SourceCache, shared_source_cache, set_shared_source_cache
+from .ratelimit import RateLimiter, TokenBucket, QuotaExceeded, shared_rate_limiter, set_shared_rate_limiter
+from .health import HealthRegistry, shared_health_registry, set_shared_health_registry
+from .tickers import MarketIndex, TickerService, shared_ticker_service, set_shared_ticker_service
+from .main import FeedSource, _request_headers
+from .http import HttpClient, HttpResponse, ValidatorStore, shared_http_client, set_shared_http_client
+from .engine import FetchEngine, fetch_all, parse_duration
+
+
+# Exchanges, by class name: their modules (and the libraries they need)
+# are only imported once a source of the class is used, see load_source()
+SOURCES = {
+    "BitcoinAverage": "bitcoinaverage",
+    "BitcoinVenezuela": "bitcoinvenezuela",
+    "Bittrex": "bittrex",
+    "Coincap": "coincap",
+    "Coinmarketcap": "coinmarketcap",
+    "CurrencyLayer": "currencylayer",
+    "Fixer": "fixer",
+    "Graphene": "graphene",
+    "Huobi": "huobi",
+    "IndoDax": "indodax",
+    "Okcoin": "okcoin",
+    "OpenExchangeRates": "openexchangerate",
+    "Poloniex": "poloniex",
+    "PoloniexVWAP": "poloniex",
+    "Quandl": "quandl",
+    "Bitstamp": "bitstamp",
+    "Aex": "aex",
+    "Zb": "zb",
+    "Lbank": "lbank",
+    "AlphaVantage": "alphavantage",
+    "Binance": "binance",
+    "Iex": "iex",
+    "WorldCoinIndex": "worldcoinindex",
+    "Coindesk": "coindesk",
+    "BitsharesFeed": "bitsharesfeed",
+    "Manual": "manual",
+    "CoinEgg": "coinegg",
+    "Composite": "composite",
+    "CoinTiger": "cointiger",
+    "MagicWallet": "magicwallet",
+    "Hertz": "hertz",
+    "Hero": "hero",
+    "Sina": "sina",
+    "Kraken": "kraken",
+    "Coinbase": "coinbase",
+}
+
+
+def load_source(klass):
+    """ The source class named ``klass``, importing its module if needed
+
+        :raises ValueError: if there is no such source
+    """
+    if klass in globals():
+        return globals()[klass]
+    if klass not in SOURCES:
+        raise ValueError("Klass %s not known!" % klass)
+    module = importlib.import_module("." + SOURCES[klass], __name__)
+    globals()[klass] = getattr(module, klass)
+    return globals()[klass]
+
+
+class _SourcesModule(types.ModuleType):
+    """ This module, loading source classes on first access, e.g.
+        ``from bitshares_pricefeed.sources import Binance``
+    """
+    def __getattr__(self, name):
+        if name in SOURCES:
+            return load_source(name)
+        raise AttributeError("module %r has no attribute %r" % (__name__, name))
+
+
+# A module level __getattr__ needs Python 3.7
+sys.modules[__name__].__class__ = _SourcesModule
@@ -1,4 +1,4 @@
-import requests
+import asyncio
 from . import FeedSource, _request_headers
 
 # pylint: disable=no-member
@@ -9,23 +9,22 @@ class AlphaVantage(FeedSource):  # Alpha Vantage
         if not hasattr(self, "api_key"):
             raise Exception("AlphaVantage FeedSource requires an 'api_key'.")
 
-    def _fetchForex(self, feed):
-        for base in self.bases:
-            for quote in self.quotes:
-                if quote == base:
-                    continue
-                url = (
-                    'https://www.alphavantage.co/query'
-                    '?function=CURRENCY_EXCHANGE_RATE&from_currency={quote}&to_currency={base}&apikey={apikey}'
-                ).format(base=base, quote=quote, apikey=self.api_key)
-                response = requests.get(url=url, headers=_request_headers, timeout=self.timeout)
-                result = response.json()
-                price = float(result['Realtime Currency Exchange Rate']['5. Exchange Rate'])
-                self.add_rate(feed, base, quote, price, 1.0)
+    async def _fetchForex(self, feed):
+        url = (
+            'https://www.alphavantage.co/query'
+            '?function=CURRENCY_EXCHANGE_RATE&from_currency={quote}&to_currency={base}&apikey={apikey}'
+        )
+        pairs = self.pairs()
+        responses = await asyncio.gather(*[
+            self._get_async(url.format(base=base, quote=quote, apikey=self.api_key)) for base, quote in pairs])
+        for (base, quote), response in zip(pairs, responses):
+            result = response.json()
+            price = float(result['Realtime Currency Exchange Rate']['5. Exchange Rate'])
+            self.add_rate(feed, base, quote, price, 1.0)
         return feed
 
 
-    def _fetchEquities(self, feed):
+    async def _fetchEquities(self, feed):
         if not hasattr(self, "equities") or len(self.equities) == 0:
             return feed
 
@@ -35,7 +34,7 @@ class AlphaVantage(FeedSource):  # Alpha Vantage
             '?function=BATCH_STOCK_QUOTES&symbols={symbols}&apikey={apikey}'
         ).format(symbols=symbols, apikey=self.api_key)
 
-        response = requests.get(url=url, headers=_request_headers, timeout=self.timeout)
+        response = await self._get_async(url)
         result = response.json()
 
         for equity in self.equities:
@@ -48,11 +47,11 @@ class AlphaVantage(FeedSource):  # Alpha Vantage
         return feed
 
 
-    def _fetch(self):
+    async def _fetch_async(self):
         feed = {}
         try:
-            feed = self._fetchForex(feed)
-            feed = self._fetchEquities(feed)
+            feed = await self._fetchForex(feed)
+            feed = await self._fetchEquities(feed)
         except Exception as e:
             raise Exception("\nError fetching results from {1}! ({0})".format(str(e), type(self).__name__))
         return feed
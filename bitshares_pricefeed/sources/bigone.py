@@ -1,12 +1,13 @@
-import requests
 from . import FeedSource, _request_headers
 
 
 class BigONE(FeedSource):
+    pair_scoped = True
+
     def _fetch(self):
         feed = {}
         url = "https://big.one/api/v2/tickers"
-        response = requests.get(url=url, headers=_request_headers, timeout=self.timeout)
+        response = self.http.get(url, headers=_request_headers, timeout=self.timeout)
         result = response.json()
         for ticker in result["data"]:
             for base in self.bases:
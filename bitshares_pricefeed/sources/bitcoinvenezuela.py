@@ -1,12 +1,13 @@
-import requests
 from . import FeedSource, _request_headers
 
 class BitcoinVenezuela(FeedSource):
+    pair_scoped = True
+
     def _fetch(self):
         feed = {}
         # FIXME: SSL check deactivated, issue with Comodo SSL certificate.
         url = "https://api.bitcoinvenezuela.com"
-        response = requests.get(url=url, headers=_request_headers, timeout=self.timeout, verify=False)
+        response = self.http.get(url, headers=_request_headers, timeout=self.timeout, verify=False)
         result = response.json()
         for base in self.bases:
             for quote in self.quotes:
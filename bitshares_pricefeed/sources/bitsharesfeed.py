@@ -5,11 +5,14 @@ from . import FeedSource, _request_headers
 # pylint: disable=no-member
 class BitsharesFeed(FeedSource):
     def _fetch(self):
-        from bitshares.asset import Asset
+        from ..chain import ChainSnapshot
         feed = {}
+        # All assets are loaded at once, into the snapshot of the run if
+        # there is one
+        snapshot = self.snapshot or ChainSnapshot()
+        snapshot.load(self.assets)
         for assetName in self.assets:
-            asset = Asset(assetName, full=True)
-            currentPrice = asset.feed['settlement_price']
+            currentPrice = snapshot.global_feed(assetName)['settlement_price']
             (base, quote) = currentPrice.symbols()
             self.add_rate(feed, base, quote, currentPrice['price'], 1.0)
         return feed
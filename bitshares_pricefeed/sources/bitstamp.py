@@ -1,20 +1,18 @@
-import requests
+import asyncio
 from . import FeedSource, _request_headers
 
 
 class Bitstamp(FeedSource):
-    def _fetch(self):
+    pair_scoped = True
+
+    async def _fetch_async(self):
         feed = {}
         url = "https://www.bitstamp.net/api/v2/ticker/{quote}{base}"
-        for base in self.bases:
-            for quote in self.quotes:
-                if quote == base:
-                    continue
-                # btcusd, btceur
-                response = requests.get(url=url.format(
-                    quote=quote.lower(),
-                    base=base.lower()
-                ), headers=_request_headers, timeout=self.timeout)
-                result = response.json()
-                self.add_rate(feed, base, quote, float(result["last"]), float(result["volume"]))
+        pairs = self.pairs()
+        # btcusd, btceur
+        responses = await asyncio.gather(*[
+            self._get_async(url.format(quote=quote.lower(), base=base.lower())) for base, quote in pairs])
+        for (base, quote), response in zip(pairs, responses):
+            result = response.json()
+            self.add_rate(feed, base, quote, float(result["last"]), float(result["volume"]))
         return feed
@@ -1,12 +1,13 @@
-import requests
 from . import FeedSource, _request_headers
 
 
 class Bittrex(FeedSource):
+    pair_scoped = True
+
     def _fetch(self):
         feed = {}
         url = "https://bittrex.com/api/v1.1/public/getmarketsummaries"
-        response = requests.get(url=url, headers=_request_headers, timeout=self.timeout)
+        response = self.http.get(url, headers=_request_headers, timeout=self.timeout)
         result = response.json()["result"]
         feed["response"] = response.json()
         for thisMarket in result:
@@ -0,0 +1,95 @@
+import gzip
+import json
+import os
+import time
+
+from appdirs import user_data_dir
+
+from .state import Shared, write_atomic
+
+import logging
+log = logging.getLogger(__name__)
+
+_shared_source_cache = Shared(lambda: SourceCache())
+
+
+class SourceCache(object):
+    """ Cache of the last successful feed of each source
+
+        Entries are keyed by :meth:`FeedSource.fingerprint`, so sources of
+        the same class with different markets or settings do not overwrite
+        each other. They are stored gzip compressed together with the time
+        they were fetched, written atomically (write then rename) and
+        pruned by age and by total size.
+
+        :param str directory: where to keep the entries, defaults to the
+            user data directory
+        :param int max_age: seconds after which entries are removed
+        :param int max_size: bytes the cache may use, oldest entries are
+            removed first
+        :param int prune_interval: seconds between two prunes
+    """
+    def __init__(self, directory=None, max_age=7 * 24 * 3600, max_size=50 * 1024 * 1024, prune_interval=3600):
+        self.directory = directory or os.path.join(
+            user_data_dir("bitshares_pricefeed", "ChainSquad GmbH"), "sources")
+        self.max_age = max_age
+        self.max_size = max_size
+        self.prune_interval = prune_interval
+        self.pruned = 0
+
+    def path(self, key):
+        return os.path.join(self.directory, key + ".json.gz")
+
+    def load(self, key, max_age=None):
+        """ Return ``(feed, age)`` of the entry for ``key``, or ``None`` if
+            there is none or it is older than ``max_age`` seconds
+        """
+        try:
+            with gzip.open(self.path(key), "rt") as fp:
+                entry = json.load(fp)
+        except (IOError, OSError, ValueError, EOFError):
+            return None
+        age = time.time() - entry["fetched"]
+        if max_age is not None and age > max_age:
+            return None
+        return entry["feed"], age
+
+    def store(self, key, feed):
+        def write(fp):
+            with gzip.open(fp, "wt") as zipped:
+                json.dump({"fetched": time.time(), "feed": feed}, zipped, separators=(",", ":"))
+        write_atomic(self.path(key), write, mode="wb")
+        if time.time() - self.pruned > self.prune_interval:
+            self.prune()
+
+    def prune(self):
+        """ Remove entries older than ``max_age``, then the oldest entries
+            until the cache fits into ``max_size``
+        """
+        self.pruned = time.time()
+        if not os.path.isdir(self.directory):
+            return
+        entries = []
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            stat = os.stat(path)
+            if self.pruned - stat.st_mtime > self.max_age:
+                os.remove(path)
+            else:
+                entries.append((stat.st_mtime, stat.st_size, path))
+        size = sum(x[1] for x in entries)
+        for _, entry_size, path in sorted(entries):
+            if size <= self.max_size:
+                break
+            os.remove(path)
+            size -= entry_size
+
+
+def shared_source_cache():
+    """ The process wide cache, used by sources created without one
+    """
+    return _shared_source_cache.get()
+
+
+def set_shared_source_cache(cache):
+    _shared_source_cache.set(cache)
@@ -1,4 +1,4 @@
-import requests
+import asyncio
 from . import FeedSource, _request_headers
 
 
@@ -7,12 +7,15 @@ class Coincap(FeedSource):
         super().__init__(*args, **kwargs)
         self.nb_coins_included_in_altcap_x = getattr(self, 'nb_coins_included_in_altcap_x', 10)
 
-    def _fetch(self):
+    async def _fetch_async(self):
         feed = {}
         base = self.bases[0]
         if base == 'BTC':
-            coincap_front = requests.get('http://www.coincap.io/front').json()
-            coincap_global = requests.get('http://www.coincap.io/global').json()
+            front, global_ = await asyncio.gather(
+                self._get_async('http://www.coincap.io/front'),
+                self._get_async('http://www.coincap.io/global'))
+            coincap_front = front.json()
+            coincap_global = global_.json()
             alt_cap = float(coincap_global["altCap"])
             alt_caps_x = [float(coin['mktcap'])
                             for coin in coincap_front[0:self.nb_coins_included_in_altcap_x+1]
@@ -1,20 +1,20 @@
-import requests
+import asyncio
 from . import FeedSource, _request_headers
 
 class CoinEgg(FeedSource):
-    def _fetch(self):
-        feed = {}
-        for base in self.bases:
-            for quote in self.quotes:
-                if quote == base:
-                    continue
+    pair_scoped = True
 
-                url = "https://api.coinegg.im/api/v1/ticker/region/{}?coin={}".format(base.lower(), quote.lower())
-                response = requests.get(url=url, headers=_request_headers, timeout=self.timeout)
-                result = response.json()
+    async def _fetch_async(self):
+        feed = {}
+        url = "https://api.coinegg.im/api/v1/ticker/region/{}?coin={}"
+        pairs = self.pairs()
+        responses = await asyncio.gather(*[
+            self._get_async(url.format(base.lower(), quote.lower())) for base, quote in pairs])
+        for (base, quote), response in zip(pairs, responses):
+            result = response.json()
 
-                if 'result' in result and result['result'] == False:
-                    continue
+            if 'result' in result and result['result'] == False:
+                continue
 
-                self.add_rate(feed, base, quote, float(result['last']), float(result["vol"]))
+            self.add_rate(feed, base, quote, float(result['last']), float(result["vol"]))
         return feed
@@ -1,13 +1,15 @@
-import requests
+import asyncio
 from . import FeedSource, _request_headers
 
 
 class Coinmarketcap(FeedSource):
-    def _fetch(self):
+    async def _fetch_async(self):
         feed = {}
         url = 'https://api.coinmarketcap.com/v1/ticker/'
-        response = requests.get(
-            url=url, headers=_request_headers, timeout=self.timeout)
+        # The altcap requests run alongside, sharing the ticker download
+        response, _ = await asyncio.gather(
+            self._get_async(url),
+            self._fetch_altcap(feed))
         result = response.json()
         for asset in result:
             for quote in self.quotes:
@@ -18,19 +20,18 @@ class Coinmarketcap(FeedSource):
                         float(asset["24h_volume_usd"]) / float(asset["price_btc"]))
 
                     self.add_rate(feed, 'USD', quote, float(asset["price_usd"]), float(asset["24h_volume_usd"]))
-        self._fetch_altcap(feed)
 
         return feed
 
-    def _fetch_altcap(self, feed):
+    async def _fetch_altcap(self, feed):
         if 'BTC' in self.bases and ('ALTCAP' in self.quotes or 'ALTCAP.X' in self.quotes):
-            ticker = requests.get(
-                'https://api.coinmarketcap.com/v1/ticker/').json()
-            global_data = requests.get(
-                'https://api.coinmarketcap.com/v1/global/').json()
-            bitcoin_data = requests.get(
-                'https://api.coinmarketcap.com/v1/ticker/bitcoin/'
-            ).json()[0]
+            ticker, global_data, bitcoin_data = await asyncio.gather(
+                self._get_async('https://api.coinmarketcap.com/v1/ticker/'),
+                self._get_async('https://api.coinmarketcap.com/v1/global/'),
+                self._get_async('https://api.coinmarketcap.com/v1/ticker/bitcoin/'))
+            ticker = ticker.json()
+            global_data = global_data.json()
+            bitcoin_data = bitcoin_data.json()[0]
             alt_caps_x = [float(coin['market_cap_usd'])
                             for coin in ticker if
                             float(coin['rank']) <= 11 and
@@ -54,18 +55,21 @@ class Coinmarketcap(FeedSource):
         return feed
 
 class CoinmarketcapPro(FeedSource):
+    pair_scoped = True
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         if not hasattr(self, 'api_key'):
             raise Exception("CoinmarketcapPro FeedSource requires 'api_key'.")
 
-    def _fetch(self):
+    async def _fetch_async(self):
         feed = {}
         url = 'https://pro-api.coinmarketcap.com/v1/cryptocurrency/quotes/latest?symbol={}&convert={}'
         headers = { **_request_headers, 'X-CMC_PRO_API_KEY': self.api_key } # pylint: disable=no-member
         all_quotes = ','.join(self.quotes)
-        for base in self.bases:
-            response = requests.get(url=url.format(all_quotes, base), headers=headers, timeout=self.timeout)
+        responses = await asyncio.gather(*[
+            self._get_async(url.format(all_quotes, base), headers=headers) for base in self.bases])
+        for base, response in zip(self.bases, responses):
             result = response.json()
             for quote, ticker in result['data'].items():
                 price = ticker['quote'][base]['price']
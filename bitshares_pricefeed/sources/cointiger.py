@@ -1,11 +1,12 @@
-import requests
 from . import FeedSource, _request_headers
 
 class CoinTiger(FeedSource):
+    pair_scoped = True
+
     def _fetch(self):
         feed = {}
         url = "https://www.cointiger.com/exchange/api/public/market/detail"
-        response = requests.get(url=url, headers=_request_headers, timeout=self.timeout)
+        response = self.http.get(url, headers=_request_headers, timeout=self.timeout)
         result = response.json()
 
         for base in self.bases:
@@ -1,5 +1,5 @@
 # pylint: disable=no-member
-from . import FeedSource, fetch_all
+from . import FeedSource, FetchEngine
 from operator import itemgetter
 import itertools
 import statistics
@@ -37,8 +37,7 @@ class Composite(FeedSource):
         extracted_feeds = []
         for source, data in feeds.items():
             if quote in data and base in data[quote]:
-                data[quote][base]['source'] = source
-                extracted_feeds.append(data[quote][base])
+                extracted_feeds.append(dict(data[quote][base], source=source))
         return extracted_feeds
 
     def _select_feed(self, feeds):
@@ -81,8 +80,14 @@ class Composite(FeedSource):
                 filtered_feed[quote][base] = self._select_feed(extracted_feeds)
         return filtered_feed
 
-    def _fetch(self):
-        feed = fetch_all(self.exchanges)
+    def children(self):
+        return self.exchanges
+
+    async def _fetch_async(self):
+        engine = self.engine or FetchEngine(
+            http=self.http, cache=self.cache, limiter=self.limiter, health=self.health,
+            tickers=self.tickers, snapshot=self.snapshot)
+        feed = await engine.fetch_children(self)
         result = self._filter(feed)
         return result
 
@@ -1,20 +1,23 @@
-import requests
+import asyncio
 from . import FeedSource, _request_headers
 
 # pylint: disable=no-member
 class CurrencyLayer(FeedSource):  # Hourly updated data over http with free subscription
+    pair_scoped = True
+    conditional = True
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         if not hasattr(self, "api_key") or not hasattr(self, "free_subscription"):
             raise Exception("CurrencyLayer FeedSource requires 'api_key' and 'free_subscription'")
 
-    def _fetch(self): 
+    async def _fetch_async(self):
         feed = {}
-        for base in self.bases:
-            url = "http://apilayer.net/api/live?access_key=%s&currencies=%s&source=%s&format=1" % (self.api_key, ",".join(self.quotes), base)
-            if self.free_subscription and base != 'USD':
-                continue
-            response = requests.get(url=url, headers=_request_headers, timeout=self.timeout)
+        url = "http://apilayer.net/api/live?access_key=%s&currencies=%s&source=%s&format=1"
+        bases = [base for base in self.bases if not (self.free_subscription and base != 'USD')]
+        responses = await asyncio.gather(*[
+            self._get_async(url % (self.api_key, ",".join(self.quotes), base)) for base in bases])
+        for base, response in zip(bases, responses):
             result = response.json()
             if result.get("source") == base:
                 for quote in self.quotes:
@@ -0,0 +1,232 @@
+import asyncio
+import copy
+import re
+from concurrent import futures
+from .. import sources
+from .cache import shared_source_cache
+from .health import shared_health_registry
+from .http import shared_http_client
+from .ratelimit import shared_rate_limiter
+from .tickers import shared_ticker_service
+
+import logging
+log = logging.getLogger(__name__)
+
+
+def parse_duration(value):
+    """ Parse a duration like ``8``, ``8s``, ``500ms``, ``5m`` or ``1h``
+        into seconds. ``None`` is returned as is.
+    """
+    if value is None or isinstance(value, (int, float)):
+        return value
+    match = re.match(r"^\s*([0-9.]+)\s*(ms|s|m|h)?\s*$", str(value))
+    if not match:
+        raise ValueError("Invalid duration '%s'" % value)
+    factor = {"ms": 0.001, "s": 1, "m": 60, "h": 3600}[match.group(2) or "s"]
+    return float(match.group(1)) * factor
+
+
+class FetchEngine(object):
+    """ Fetch a set of exchanges concurrently on a single event loop
+
+        Every source is driven through :meth:`FeedSource.fetch_async`:
+        sources implementing ``_fetch_async`` issue all their HTTP requests
+        at once, blocking ``_fetch`` implementations are run on the
+        engine's thread pool. The fetch phase thus lasts as long as the
+        slowest request instead of the sum of each source's requests.
+
+        Composite sources are not given a pool of their own: their
+        children are scheduled on the same loop and executor, whatever the
+        nesting depth, and the aggregation runs once all children are in.
+        Only leaf sources count against the ``max_workers`` limit, so the
+        number of threads stays bounded by ``max_workers``.
+
+        Leaf sources are deduplicated over the whole tree before fetching:
+        sources with the same :meth:`FeedSource.fingerprint` and fetch
+        options, at top level or inside composites, are fetched once (see
+        :meth:`FeedSource.covers`). :attr:`saved` counts the fetches
+        spared this way.
+
+        :param int max_workers: size of the thread pool backing blocking
+            calls (one per in-flight HTTP request)
+        :param HttpClient http: connection pool handed to every source,
+            defaults to the process wide shared client
+        :param float deadline: overall fetch budget in seconds. Sources
+            still running when it expires are reported in :attr:`late`
+            and recovered like failed sources (see
+            :meth:`FeedSource.recover`).
+        :param SourceCache cache: cache handed to every source, defaults
+            to the process wide shared cache
+        :param RateLimiter limiter: rate limiter handed to every source,
+            defaults to the process wide shared limiter
+        :param priority: symbols the feed needs, sources short on request
+            quota query their markets first
+        :param HealthRegistry health: health records handed to every
+            source, defaults to the process wide shared registry
+        :param TickerService tickers: DEX tickers handed to every source,
+            defaults to the process wide shared service
+        :param ChainSnapshot snapshot: chain state of the run handed to
+            every source, sources reading the chain take their own
+            otherwise
+    """
+    def __init__(self, max_workers=32, http=None, deadline=None, cache=None, limiter=None, priority=(),
+                 health=None, tickers=None, snapshot=None):
+        self.max_workers = max_workers
+        self.http = http or shared_http_client()
+        self.cache = cache or shared_source_cache()
+        self.limiter = limiter or shared_rate_limiter()
+        self.priority = set(priority)
+        self.health = health or shared_health_registry()
+        self.tickers = tickers or shared_ticker_service()
+        self.snapshot = snapshot
+        self.deadline = parse_duration(deadline)
+        self.reset()
+
+    def reset(self):
+        """ Forget the state of the previous run
+        """
+        self.late = []
+        self.durations = {}
+        self.slots = None
+        self.saved = 0
+        self.children = {}
+        self.providers = {}
+        self.consumers = {}
+        self.fetches = {}
+
+    def instantiate(self, exchanges):
+        """ Create the enabled sources of an ``exchanges`` configuration
+        """
+        instances = {}
+        for name, exchange in exchanges.items():
+            if "enable" in exchange and not exchange["enable"]:
+                continue
+            klass = sources.load_source(exchange["klass"])
+            instances[name] = klass(http=self.http, engine=self, cache=self.cache, limiter=self.limiter,
+                                    health=self.health, tickers=self.tickers, snapshot=self.snapshot,
+                                    **exchange)
+        return instances
+
+    def plan(self, instances):
+        """ Instantiate the sub-sources of composites and assign every leaf
+            source the instance whose fetch it will be served from
+        """
+        leaves = []
+        stack = list(instances.values())
+        while stack:
+            instance = stack.pop(0)
+            if instance.children():
+                self.children[id(instance)] = self.instantiate(instance.children())
+                stack.extend(self.children[id(instance)].values())
+            else:
+                leaves.append(instance)
+
+        for leaf in leaves:
+            provider = next(x for x in leaves if x.covers(leaf))
+            self.providers[id(leaf)] = provider
+            self.consumers[id(provider)] = self.consumers.get(id(provider), 0) + 1
+
+    def run(self, exchanges):
+        """ Fetch all enabled exchanges and return their feeds by name
+        """
+        self.reset()
+        self.http.reset()
+        instances = self.instantiate(exchanges)
+        self.plan(instances)
+        loop = asyncio.new_event_loop()
+        pool = futures.ThreadPoolExecutor(max_workers=self.max_workers)
+        loop.set_default_executor(pool)
+        try:
+            return loop.run_until_complete(self.fetch_instances(instances))
+        finally:
+            loop.close()
+            pool.shutdown(wait=False)
+            self.limiter.save()
+            self.health.save()
+            self.tickers.index.save()
+
+    async def fetch_instances(self, instances):
+        """ Fetch the instances, collecting feeds as sources complete
+        """
+        loop = asyncio.get_event_loop()
+        start = loop.time()
+        end = start + self.deadline if self.deadline else None
+        tasks = {}
+        for name, instance in instances.items():
+            tasks[asyncio.ensure_future(self.fetch_source(instance))] = name
+
+        results = {}
+        pending = set(tasks)
+        while pending:
+            timeout = max(0, end - loop.time()) if end else None
+            done, pending = await asyncio.wait(
+                pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                break
+            for task in done:
+                name = tasks[task]
+                self.durations[name] = loop.time() - start
+                log.info("Fetched %s in %.2fs", name, self.durations[name])
+                results[name] = task.result()
+
+        if pending:
+            # Nobody waits on the remaining (shared) fetches past this point
+            unfinished = list(pending) + [x for x in self.fetches.values() if not x.done()]
+            for task in unfinished:
+                task.cancel()
+            await asyncio.gather(*unfinished, return_exceptions=True)
+        for task in pending:
+            name = tasks[task]
+            self.late.append(name)
+            results[name] = instances[name].recover("missed the fetch deadline")
+        if self.saved:
+            log.info("%d duplicate source fetches saved", self.saved)
+        if self.http.saved:
+            log.info("%d duplicate HTTP requests coalesced", self.http.saved)
+        if self.late:
+            print("\nSources that missed the fetch deadline of {0}s: {1}".format(
+                self.deadline, ", ".join(sorted(self.late))))
+
+        # Keep the configuration order
+        return {name: results[name] for name in instances}
+
+    async def fetch_source(self, instance):
+        """ Fetch one source. Composites only wait on their children,
+            leaves are served from the (shared) fetch of their provider.
+        """
+        if instance.children():
+            return await instance.fetch_async()
+        provider = self.providers.get(id(instance), instance)
+        if id(provider) not in self.fetches:
+            self.fetches[id(provider)] = asyncio.ensure_future(self.fetch_leaf(provider))
+        else:
+            self.saved += 1
+        # Shielded: a consumer missing the deadline must not cancel the
+        # fetch other consumers are waiting on
+        feed = await asyncio.shield(self.fetches[id(provider)])
+        if self.consumers.get(id(provider), 1) > 1:
+            feed = copy.deepcopy(feed)
+        return feed
+
+    async def fetch_leaf(self, instance):
+        if self.slots is None:
+            self.slots = asyncio.Semaphore(self.max_workers)
+        async with self.slots:
+            return await instance.fetch_async()
+
+    async def fetch_children(self, instance):
+        """ Fetch the sub-sources of a composite source by name
+        """
+        if id(instance) not in self.children:
+            self.plan({None: instance})
+        children = self.children[id(instance)]
+        names = list(children)
+        results = await asyncio.gather(*[self.fetch_source(children[name]) for name in names])
+        return dict(zip(names, results))
+
+
+def fetch_all(exchanges, max_workers=32, http=None, deadline=None, cache=None, limiter=None, health=None,
+              tickers=None):
+    return FetchEngine(
+        max_workers=max_workers, http=http, deadline=deadline, cache=cache, limiter=limiter,
+        health=health, tickers=tickers).run(exchanges)
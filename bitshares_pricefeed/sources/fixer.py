@@ -1,20 +1,23 @@
-import requests
+import asyncio
 from . import FeedSource, _request_headers
 
 # pylint: disable=no-member
 class Fixer(FeedSource):  # fixer.io daily updated data from European Central Bank.
+    pair_scoped = True
+    conditional = True
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         if not hasattr(self, "api_key") or not hasattr(self, "free_subscription"):
             raise Exception("Fixer FeedSource requires 'api_key' and 'free_subscription'")
 
-    def _fetch(self):
+    async def _fetch_async(self):
         feed = {}
-        for base in self.bases:
-            if self.free_subscription and base != 'EUR':
-                continue
-            url = "http://data.fixer.io/api/latest?access_key=%s&base=%s" % (self.api_key, base)
-            response = requests.get(url=url, headers=_request_headers, timeout=self.timeout)
+        bases = [base for base in self.bases if not (self.free_subscription and base != 'EUR')]
+        responses = await asyncio.gather(*[
+            self._get_async("http://data.fixer.io/api/latest?access_key=%s&base=%s" % (self.api_key, base))
+            for base in bases])
+        for base, response in zip(bases, responses):
             result = response.json()
             for quote in self.quotes:
                 if quote == base:
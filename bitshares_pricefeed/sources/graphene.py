@@ -3,14 +3,18 @@ from . import FeedSource, _request_headers
 
 
 class Graphene(FeedSource):
+    pair_scoped = True
+
     def _fetch(self):
-        from bitshares.market import Market
         feed = {}
-        for base in self.bases:
-            for quote in self.quotes:
-                if quote == base:
-                    continue
-                ticker = Market("%s:%s" % (quote, base)).ticker()
-                if (float(ticker["latest"])) > 0 and float(ticker["quoteVolume"]) > 0:
-                    self.add_rate(feed, base, quote, float(ticker["latest"]), float(ticker["quoteVolume"]))
+        markets = [
+            ("%s:%s" % (quote, base), base, quote)
+            for base in self.bases for quote in self.quotes if quote != base]
+        # Markets recently found without liquidity are not queried
+        markets = [x for x in markets if self.tickers.index.liquid(x[0]) is not False]
+        self.tickers.prefetch([x[0] for x in markets])
+        for market, base, quote in markets:
+            ticker = self.tickers.ticker(market)
+            if (float(ticker["latest"])) > 0 and float(ticker["quoteVolume"]) > 0:
+                self.add_rate(feed, base, quote, float(ticker["latest"]), float(ticker["quoteVolume"]))
         return feed
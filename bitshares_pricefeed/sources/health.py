@@ -0,0 +1,115 @@
+import os
+import threading
+import time
+
+from appdirs import user_data_dir
+
+from .state import Shared, load_json, save_json
+
+import logging
+log = logging.getLogger(__name__)
+
+# Standalone sources run once, keep their health in memory only
+_shared_health_registry = Shared(lambda: HealthRegistry(persist=False))
+
+
+class HealthRegistry(object):
+    """ Health of the sources over runs, with a circuit breaker
+
+        For every source (keyed by :meth:`FeedSource.fingerprint`) the
+        consecutive failures, an exponentially weighted moving average of
+        the fetch latency and the time of the last success are recorded.
+
+        After ``threshold`` consecutive failures the circuit of a source
+        opens: it is not fetched for ``backoff`` seconds. Once that delay
+        has passed the circuit is half-open and a single fetch probes the
+        source. A success closes the circuit, a failure opens it again
+        for twice as long, up to ``max_backoff``.
+
+        The records are persisted in ``state_file``; :meth:`save` writes
+        them.
+
+        :param str state_file: where to persist the records, defaults to
+            the user data directory
+        :param bool persist: load and save the records
+        :param int threshold: consecutive failures opening the circuit
+        :param float backoff: seconds the circuit first stays open
+        :param float max_backoff: longest time the circuit stays open
+        :param float alpha: weight of the latest latency in the average
+    """
+    def __init__(self, state_file=None, persist=True, threshold=3, backoff=60, max_backoff=3600, alpha=0.3):
+        self.state_file = state_file or os.path.join(
+            user_data_dir("bitshares_pricefeed", "ChainSquad GmbH"), "health.json")
+        self.threshold = threshold
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.alpha = alpha
+        self.persist = persist
+        self.lock = threading.Lock()
+        self.records = load_json(self.state_file, {}) if persist else {}
+
+    def record(self, key):
+        return self.records.setdefault(key, {
+            "failures": 0,
+            "latency": None,
+            "last_success": None,
+            "last_error": None,
+            "opened_until": None,
+            "backoff": 0,
+        })
+
+    def state(self, key):
+        """ ``closed``, ``open`` or ``half-open``
+        """
+        record = self.records.get(key)
+        if not record or not record["opened_until"]:
+            return "closed"
+        if time.time() < record["opened_until"]:
+            return "open"
+        return "half-open"
+
+    def allow(self, key):
+        """ May the source be fetched (circuit closed or half-open)?
+        """
+        return self.state(key) != "open"
+
+    def success(self, key, latency):
+        with self.lock:
+            record = self.record(key)
+            record.update(failures=0, opened_until=None, backoff=0, last_success=time.time())
+            self._latency(record, latency)
+
+    def failure(self, key, latency, error=None):
+        with self.lock:
+            record = self.record(key)
+            record["failures"] += 1
+            record["last_error"] = error
+            self._latency(record, latency)
+            if record["failures"] >= self.threshold:
+                record["backoff"] = min(self.max_backoff, record["backoff"] * 2 or self.backoff)
+                record["opened_until"] = time.time() + record["backoff"]
+                log.warning("Circuit opened for %ds after %d failures", record["backoff"], record["failures"])
+
+    def _latency(self, record, latency):
+        if record["latency"] is None:
+            record["latency"] = latency
+        else:
+            record["latency"] = self.alpha * latency + (1 - self.alpha) * record["latency"]
+
+    def save(self):
+        """ Atomically persist the records
+        """
+        with self.lock:
+            if not self.persist or not self.records:
+                return
+            save_json(self.state_file, self.records)
+
+
+def shared_health_registry():
+    """ The process wide registry, used by sources created without one
+    """
+    return _shared_health_registry.get()
+
+
+def set_shared_health_registry(registry):
+    _shared_health_registry.set(registry)
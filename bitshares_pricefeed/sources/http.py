@@ -0,0 +1,293 @@
+import functools
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent import futures
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from appdirs import user_data_dir
+
+from .ratelimit import shared_rate_limiter
+from .state import Shared, load_json, save_json
+
+import logging
+log = logging.getLogger(__name__)
+
+# Nothing marks the runs of standalone sources, do not coalesce
+_shared_http_client = Shared(lambda: HttpClient(coalesce=False))
+
+
+class HttpResponse(object):
+    """ A ``requests.Response`` whose JSON body is parsed only once
+
+        Coalesced requests share one instance, so the parsed body must be
+        treated as read-only.
+    """
+    def __init__(self, response, key=None):
+        self.response = response
+        # Key of the body stored for a conditional request
+        self.key = key
+        self._json = None
+
+    def __getattr__(self, name):
+        return getattr(self.response, name)
+
+    def json(self, **kwargs):
+        if self._json is None:
+            self._json = self.response.json(**kwargs)
+        return self._json
+
+
+class ValidatorStore(object):
+    """ On disk store of HTTP validators (``ETag``, ``Last-Modified``)
+        and of the last body received for a request
+
+        :param str directory: where to keep the entries, defaults to the
+            user data directory
+    """
+    def __init__(self, directory=None):
+        self.directory = directory or os.path.join(
+            user_data_dir("bitshares_pricefeed", "ChainSquad GmbH"), "http")
+
+    def path(self, key):
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, digest + ".json")
+
+    def load(self, key):
+        return load_json(self.path(key))
+
+    def save(self, key, entry):
+        """ Atomically (write then rename) store an entry
+        """
+        save_json(self.path(key), entry)
+
+    def remove(self, key):
+        try:
+            os.remove(self.path(key))
+        except OSError:
+            pass
+
+    def prune(self, max_age):
+        """ Remove entries not refreshed for ``max_age`` seconds
+        """
+        if not os.path.isdir(self.directory):
+            return
+        limit = time.time() - max_age
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if os.path.getmtime(path) < limit:
+                os.remove(path)
+
+
+class HttpClient(object):
+    """ Connection pooled HTTP client shared by all sources
+
+        Connections are kept alive per host, so a run only pays one TCP
+        and TLS handshake per host and pooled connection instead of one
+        per request. Responses are negotiated gzip/deflate compressed.
+
+        GET requests are coalesced within a run: concurrent or repeated
+        requests for the same URL, parameters and headers share a single
+        network call and a single parsed body. :attr:`saved` counts the
+        calls spared; :meth:`reset` starts a new run.
+
+        Conditional requests (``conditional=True``) keep the validators and
+        body of the last response in a :class:`ValidatorStore`, send
+        ``If-None-Match``/``If-Modified-Since`` and reuse the stored body
+        on ``304 Not Modified``. With a ``refresh_interval``, the stored
+        body is served without any request until it is that old.
+
+        Requests given a ``rate_limit`` (the ``rateLimit`` settings of a
+        source) are accounted on a :class:`RateLimiter` and wait for its
+        token bucket before being sent. Coalesced and stored responses
+        cost nothing. :meth:`limited` binds the settings of a source.
+
+        :param int pool_connections: number of hosts to keep a pool for
+        :param int pool_maxsize: connections kept alive per host, i.e.
+            concurrent requests to one host that reuse a connection
+        :param int max_retries: retries on connection failures
+        :param bool keep_alive: keep connections open between requests
+        :param bool coalesce: share identical GET requests within a run
+        :param str validators_dir: directory of the :class:`ValidatorStore`
+        :param int validators_max_age: seconds after which stored bodies
+            that were not revalidated are dropped
+    """
+    def __init__(self, pool_connections=32, pool_maxsize=16, max_retries=0, keep_alive=True, coalesce=True,
+                 validators_dir=None, validators_max_age=7 * 24 * 3600):
+        self.coalesce = coalesce
+        self.validators = ValidatorStore(validators_dir)
+        self.validators.prune(validators_max_age)
+        self.lock = threading.Lock()
+        self.reset()
+        self.session = requests.Session()
+        self.session.headers["Accept-Encoding"] = "gzip, deflate"
+        self.session.headers["Connection"] = "keep-alive" if keep_alive else "close"
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=max_retries)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def reset(self):
+        """ Start a new run: forget the responses of coalesced requests
+        """
+        with self.lock:
+            self.requests = {}
+            self.saved = 0
+
+    @staticmethod
+    def rate_key(url, rate_limit):
+        """ Key a request to ``url`` is accounted on: the configured
+            ``key`` of ``rate_limit``, else the host
+        """
+        return rate_limit.get("key") or urlparse(url).netloc
+
+    def limited(self, rate_limit, limiter=None, owner=None):
+        """ View of this client sending every request under ``rate_limit``
+        """
+        return LimitedHttpClient(self, rate_limit, limiter, owner)
+
+    def request(self, method, url, rate_limit=None, limiter=None, **kwargs):
+        """ Send a request, first waiting for ``rate_limit`` if given
+
+            :raises QuotaExceeded: when the quota of the request's key is
+                used up
+        """
+        if rate_limit:
+            limiter = limiter or shared_rate_limiter()
+            delay = limiter.acquire(self.rate_key(url, rate_limit), rate_limit)
+            if delay:
+                time.sleep(delay)
+        return self.session.request(method, url, **kwargs)
+
+    def get(self, url, conditional=False, refresh_interval=0, rate_limit=None, limiter=None, **kwargs):
+        key = json.dumps([
+            url,
+            kwargs.get("params"),
+            kwargs.get("headers"),
+            kwargs.get("verify", True),
+        ], sort_keys=True, default=str)
+        stored = key if conditional or refresh_interval else None
+        if stored:
+            send = functools.partial(
+                self.get_conditional, key, url, refresh_interval, rate_limit=rate_limit, limiter=limiter, **kwargs)
+        else:
+            send = functools.partial(self.request, "GET", url, rate_limit, limiter, **kwargs)
+        if not self.coalesce or kwargs.get("stream"):
+            return HttpResponse(send(), stored)
+        with self.lock:
+            request = self.requests.get(key)
+            owner = request is None
+            if owner:
+                request = self.requests[key] = futures.Future()
+            else:
+                self.saved += 1
+        if owner:
+            try:
+                request.set_result(HttpResponse(send(), stored))
+            except Exception as e:
+                # Do not keep failures around, a later request may succeed
+                with self.lock:
+                    self.requests.pop(key, None)
+                request.set_exception(e)
+        return request.result()
+
+    def get_conditional(self, key, url, refresh_interval=0, rate_limit=None, limiter=None, **kwargs):
+        """ GET revalidating the body stored for ``key``, see class doc
+        """
+        entry = self.validators.load(key)
+        if entry and time.time() - entry["fetched"] < refresh_interval:
+            log.info("Reusing %s, refreshed %ds ago", url, time.time() - entry["fetched"])
+            return self.stored_response(url, entry)
+
+        headers = dict(kwargs.pop("headers", None) or {})
+        if entry and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        response = self.request("GET", url, rate_limit, limiter, headers=headers, **kwargs)
+
+        if response.status_code == 304 and entry:
+            entry["fetched"] = time.time()
+            self.validators.save(key, entry)
+            return self.stored_response(url, entry)
+        if response.status_code == 200 and (
+            refresh_interval or "ETag" in response.headers or "Last-Modified" in response.headers
+        ):
+            self.validators.save(key, {
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "content_type": response.headers.get("Content-Type"),
+                "body": response.text,
+                "fetched": time.time(),
+            })
+        return response
+
+    def reject(self, response):
+        """ Drop the body stored for a conditional request, e.g. an error
+            payload sent with status 200, so that it is not reused
+        """
+        if response.key:
+            self.validators.remove(response.key)
+
+    @staticmethod
+    def stored_response(url, entry):
+        response = requests.Response()
+        response.status_code = 200
+        response.url = url
+        response.encoding = "utf-8"
+        response._content = entry["body"].encode("utf-8")
+        response.headers = CaseInsensitiveDict({"Content-Type": entry.get("content_type") or ""})
+        return response
+
+    def post(self, url, rate_limit=None, limiter=None, **kwargs):
+        return HttpResponse(self.request("POST", url, rate_limit, limiter, **kwargs))
+
+    def close(self):
+        self.session.close()
+
+
+class LimitedHttpClient(object):
+    """ View of a :class:`HttpClient` sending every request, whatever
+        path it takes, under the ``rate_limit`` of a source
+
+        The keys requests were accounted on are recorded on the limiter
+        for ``owner``, see :meth:`RateLimiter.keys_of`.
+    """
+    def __init__(self, client, rate_limit, limiter=None, owner=None):
+        self.client = client
+        self.rate_limit = rate_limit
+        self.limiter = limiter or shared_rate_limiter()
+        self.owner = owner
+
+    def account(self, url):
+        if self.owner:
+            self.limiter.note(self.owner, self.client.rate_key(url, self.rate_limit))
+
+    def get(self, url, **kwargs):
+        self.account(url)
+        return self.client.get(url, rate_limit=self.rate_limit, limiter=self.limiter, **kwargs)
+
+    def post(self, url, **kwargs):
+        self.account(url)
+        return self.client.post(url, rate_limit=self.rate_limit, limiter=self.limiter, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self.client, name)
+
+
+def shared_http_client():
+    """ The process wide client, used by sources created without one
+    """
+    return _shared_http_client.get()
+
+
+def set_shared_http_client(client):
+    _shared_http_client.set(client)
@@ -1,12 +1,13 @@
-import requests
 from . import FeedSource, _request_headers
 
 
 class Huobi(FeedSource):
+    pair_scoped = True
+
     def _fetch(self):
         feed = {}
         url = "https://api.huobi.pro/market/tickers"
-        response = requests.get(url=url, headers=_request_headers, timeout=self.timeout)
+        response = self.http.get(url, headers=_request_headers, timeout=self.timeout)
         result = response.json()
         if result['status'] == 'error':
             raise Exception(result['err-msg'])
@@ -1,4 +1,4 @@
-import requests
+import asyncio
 from . import FeedSource, _request_headers
 
 # pylint: disable=no-member
@@ -12,14 +12,14 @@ class Iex(FeedSource): # Stocks prices from iextrading.com
             symbols_by_base[base].append(symbol)
         return symbols_by_base
 
-    def _fetch(self):
+    async def _fetch_async(self):
         symbols_by_base = self._extract_symbols()
         feed = {}
         url = "https://api.iextrading.com/1.0/stock/market/batch?symbols={symbols}&types=quote"
-        for base in symbols_by_base.keys():
-            response = requests.get(url=url.format(
-                symbols=','.join(symbols_by_base[base])
-            ), headers=_request_headers, timeout=self.timeout)
+        bases = list(symbols_by_base.keys())
+        responses = await asyncio.gather(*[
+            self._get_async(url.format(symbols=','.join(symbols_by_base[base]))) for base in bases])
+        for base, response in zip(bases, responses):
             result = response.json()
             for symbol in result.keys():
                 ticker = result[symbol]['quote']
@@ -1,23 +1,23 @@
+import asyncio
 import requests
 from . import FeedSource, _request_headers
 
 
 class Kraken(FeedSource):
-    def _fetch(self):
-        feed = {}
-        for base in self.bases:
-            for quote in self.quotes:
-                if quote == base:
-                    continue
+    pair_scoped = True
 
-                pair = '{}{}'.format(quote.upper(), base.upper())
-                url = "https://api.kraken.com/0/public/Ticker?pair={}".format(pair)
-                response = requests.get(url=url, headers=_request_headers, timeout=self.timeout)
-                if response.status_code != requests.codes.ok: # pylint: disable=no-member
-                    print('No result on Kraken for {}'.format(pair))
-                    continue
-                result = response.json()['result'][pair]
-                self.add_rate(feed, base, quote, float(result['c'][0]), float(result['v'][1]))
+    async def _fetch_async(self):
+        feed = {}
+        pairs = self.pairs()
+        urls = ["https://api.kraken.com/0/public/Ticker?pair={}{}".format(quote.upper(), base.upper()) for base, quote in pairs]
+        responses = await asyncio.gather(*[self._get_async(url) for url in urls])
+        for (base, quote), response in zip(pairs, responses):
+            pair = '{}{}'.format(quote.upper(), base.upper())
+            if response.status_code != requests.codes.ok: # pylint: disable=no-member
+                print('No result on Kraken for {}'.format(pair))
+                continue
+            result = response.json()['result'][pair]
+            self.add_rate(feed, base, quote, float(result['c'][0]), float(result['v'][1]))
         
         return feed
 
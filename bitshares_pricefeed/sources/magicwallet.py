@@ -1,4 +1,3 @@
-import requests
 from . import FeedSource, _request_headers
 
 # pylint: disable=no-member
@@ -34,7 +33,7 @@ class MagicWallet(FeedSource):
             raise Exception("MagicWallet only supports BITCNY/CNY pair.")
         
         url = 'https://redemption.icowallet.net/api_v2/RechargeAndWithdrawTables/GetListForRechargeAndWithdrawtable'
-        response = requests.post(url=url, headers={ **_request_headers, 'apikey': self.api_key } , timeout=self.timeout)
+        response = self.http.post(url, headers={ **_request_headers, 'apikey': self.api_key } , timeout=self.timeout)
         result = response.json()
         if response.status_code != 200:
             raise Exception('Error from MagicWallet API: {}'.format(result))
@@ -1,14 +1,16 @@
-import datetime
+import asyncio
+import functools
+import hashlib
 import json
-import os
 import sys
+import time
 import traceback
-from concurrent import futures
-from .. import sources
 
-import requests
-
-from appdirs import user_data_dir
+from .cache import shared_source_cache
+from .health import shared_health_registry
+from .http import shared_http_client
+from .ratelimit import shared_rate_limiter
+from .tickers import shared_ticker_service
 
 import logging
 log = logging.getLogger(__name__)
@@ -16,44 +18,78 @@ log = logging.getLogger(__name__)
 _request_headers = {'content-type': 'application/json',
                     'User-Agent': 'Mozilla/5.0 (X11; Ubuntu; Linux x86_64; rv:22.0) Gecko/20100101 Firefox/22.0'}
 
-def fetch_all(exchanges):
-    feed = {}
-    pool = futures.ThreadPoolExecutor(max_workers=8)
-
-    threads = {}
+class FeedSource():
+    # Set on sources whose feed only holds markets of ``bases`` x
+    # ``quotes``, e.g. to skip them when none of these markets is needed.
+    pair_scoped = False
 
-    for name, exchange in exchanges.items():
-        if "enable" in exchange and not exchange["enable"]:
-            continue
-        if not hasattr(sources, exchange["klass"]):
-            raise ValueError("Klass %s not known!" % exchange["klass"])
-        klass = getattr(sources, exchange["klass"])
-        instance = klass(**exchange)
-        threads[name] = pool.submit(instance.fetch)
+    # Set on sources whose data changes slowly (e.g. daily rates): their
+    # requests are then revalidated with ETag/Last-Modified and answered
+    # from the stored body on 304 Not Modified.
+    conditional = False
 
-    for name in threads:
-        log.info("Checking %s ...", name)
-        feed[name] = threads[name].result()
-    return feed
+    # Minimum number of seconds between two requests of the same URL.
+    # Within that window the last stored body is reused without any
+    # request. Can be set per exchange in the configuration.
+    refreshInterval = 0
 
-class FeedSource():
     def __init__(self, scaleVolumeBy=1.0,
                  enable=True,
                  allowFailure=True,
                  allowCache=False,
+                 cacheTTL=0,
+                 cacheMaxStaleness=24 * 3600,
+                 refreshInterval=None,
+                 rateLimit=None,
                  timeout=5,
                  quotes=[],
                  bases=[],
                  aliases={},
+                 http=None,
+                 engine=None,
+                 cache=None,
+                 limiter=None,
+                 health=None,
+                 tickers=None,
+                 snapshot=None,
+                 fetchInterval=None,
                  **kwargs):
         self.scaleVolumeBy = scaleVolumeBy
         self.enabled = enable
         self.allowFailure = allowFailure
         self.allowCache = allowCache
+        self.cacheTTL = cacheTTL
+        self.cacheMaxStaleness = cacheMaxStaleness
+        if refreshInterval is not None:
+            self.refreshInterval = refreshInterval
+        self.rateLimit = rateLimit
         self.timeout = timeout
         self.bases = bases
         self.aliases = aliases
         self.quotes = quotes
+        self.http = http or shared_http_client()
+        self.engine = engine
+        self.cache = cache or shared_source_cache()
+        self.limiter = limiter or shared_rate_limiter()
+        self.health = health or shared_health_registry()
+        self.tickers = tickers or shared_ticker_service()
+        self.snapshot = snapshot
+        # Conditional responses of the current fetch, see fetch_async
+        self.responses = []
+        # Seconds between two fetches in daemon mode, see Daemon
+        self.fetchInterval = fetchInterval
+        # Settings that determine the fetched data, see fingerprint()
+        self.settings = dict(
+            kwargs,
+            klass=type(self).__name__,
+            scaleVolumeBy=scaleVolumeBy,
+            quotes=quotes,
+            bases=bases,
+            aliases=aliases)
+
+        if rateLimit:
+            # Limit every request of this source, not only _get_async's
+            self.http = self.http.limited(rateLimit, self.limiter, self.fingerprint())
 
         [setattr(self, key, kwargs[key]) for key in kwargs]
         # Why fail if the scaleVolumeBy is 0
@@ -61,51 +97,175 @@ class FeedSource():
             self.allowFailure = True
 
     def fetch(self):
+        """ Fetch the feed on a private event loop, see :meth:`fetch_async`
+        """
+        loop = asyncio.new_event_loop()
         try:
-            feed = self._fetch() # pylint: disable=no-member
-            if self.allowCache:
-                self.updateCache(feed)
-            return feed
-        except Exception:
+            return loop.run_until_complete(self.fetch_async())
+        finally:
+            loop.close()
+            if self.rateLimit:
+                self.limiter.save()
+
+    async def fetch_async(self):
+        """ Fetch the feed, falling back to the cache on failure. With
+            ``allowCache``, a cached feed younger than ``cacheTTL`` seconds
+            is returned without fetching.
+
+            The outcome of fetching a leaf source is recorded in the
+            :class:`HealthRegistry`; while its circuit is open, a source
+            that may fail is not fetched and served from the cache.
+        """
+        if self.allowCache and self.cacheTTL:
+            cached = self.cache.load(self.fingerprint(), max_age=self.cacheTTL)
+            if cached:
+                return cached[0]
+        leaf = not self.children()
+        if leaf and self.allowFailure and not self.health.allow(self.fingerprint()):
+            print("\nSkipping {0}, it failed repeatedly.".format(type(self).__name__))
+            return self.recoverFromCache() if self.allowCache else {}
+        start = time.time()
+        self.responses = []
+        try:
+            feed = await self._fetch_async()
+        except asyncio.CancelledError:
+            if leaf:
+                self.health.failure(self.fingerprint(), time.time() - start, "cancelled")
+            raise
+        except Exception as e:
+            if leaf:
+                self.health.failure(self.fingerprint(), time.time() - start, str(e))
+            # Bodies that could not be parsed must not be reused
+            for response in self.responses:
+                self.http.reject(response)
+            return self.recover()
+        if leaf:
+            self.health.success(self.fingerprint(), time.time() - start)
+        if self.allowCache:
+            self.updateCache(feed)
+        return feed
+
+    async def _fetch_async(self):
+        """ Adapter for sources that only implement the blocking
+            ``_fetch``: run it on the event loop's executor. Sources that
+            issue several requests should override this method and await
+            :meth:`_get_async` for each of them.
+        """
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(None, self._fetch) # pylint: disable=no-member
+
+    async def _get_async(self, url, headers=_request_headers, **kwargs):
+        """ Non blocking GET through the shared HTTP client, run on the
+            event loop's executor
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        if self.conditional or self.refreshInterval:
+            kwargs.setdefault("conditional", True)
+            kwargs.setdefault("refresh_interval", self.refreshInterval)
+        loop = asyncio.get_event_loop()
+        response = await loop.run_in_executor(None, functools.partial(
+            self.http.get, url, headers=headers, **kwargs))
+        if kwargs.get("conditional"):
+            self.responses.append(response)
+        return response
+
+    def quota_left(self):
+        """ Requests left in the ``rateLimit`` quota, ``None`` if
+            unlimited or unknown. Without a configured ``key``, the
+            quota is known once the source sent requests to its hosts.
+        """
+        if not self.rateLimit:
+            return None
+        keys = [self.rateLimit["key"]] if self.rateLimit.get("key") else self.limiter.keys_of(self.fingerprint())
+        left = [self.limiter.remaining(key, self.rateLimit) for key in keys]
+        left = [x for x in left if x is not None]
+        return min(left) if left else None
+
+    def children(self):
+        """ Exchanges configuration of the sub-sources this source
+            aggregates, fetched by the engine before this source
+        """
+        return {}
+
+    def fingerprint(self, ignore=()):
+        """ Stable hash of the settings that determine this source's data,
+            i.e. two sources with the same fingerprint fetch the same feed
+        """
+        settings = {key: value for key, value in self.settings.items() if key not in ignore}
+        encoded = json.dumps(settings, sort_keys=True, default=str)
+        return hashlib.sha1(encoded.encode("utf-8")).hexdigest()
+
+    def fetch_options(self):
+        """ Settings of how this source fetches (timeout, failure and cache
+            fallback, reuse of stored bodies, rate limit), which do not
+            change the fetched data
+        """
+        return (
+            self.allowFailure, self.allowCache, self.cacheTTL, self.cacheMaxStaleness, self.timeout,
+            self.refreshInterval, self.rateLimit)
+
+    def covers(self, other):
+        """ Can this source's fetch serve the ``other`` source, i.e. does
+            it fetch the very same markets the way ``other`` would?
+
+            Sources with different markets are not shared: a wider fetch
+            may fail, or be cut by a rate limit quota, on markets the
+            other source does not have.
+        """
+        return self.fetch_options() == other.fetch_options() and self.fingerprint() == other.fingerprint()
+
+    def pairs(self):
+        """ All (base, quote) markets configured for this source
+
+            If the ``rateLimit`` quota left does not allow to query them
+            all, markets of assets the feed needs (see
+            :attr:`FetchEngine.priority`) are kept first.
+        """
+        pairs = [(base, quote) for base in self.bases for quote in self.quotes if quote != base]
+        remaining = self.quota_left()
+        if remaining is not None and remaining < len(pairs):
+            priority = self.engine.priority if self.engine else set()
+            pairs.sort(key=lambda pair: -len(priority.intersection(pair)))
+            log.warning("%s: quota only allows %d of %d markets", type(self).__name__, max(0, remaining), len(pairs))
+            pairs = pairs[:max(0, remaining)]
+        return pairs
+
+    def recover(self, error="encountered an error while loading live data"):
+        """ Handle a failed live fetch: print the error and try the cache
+
+            :param str error: what went wrong, the traceback of the
+                exception being handled is printed too if there is one
+        """
+        if sys.exc_info()[0] is not None:
             traceback.print_exc()
-            if not self.allowCache:
-                print("\n{0} encountered an error while loading live data.".format(type(self).__name__))
-                return {}
+        if not self.allowCache:
+            print("\n{0} {1}.".format(type(self).__name__, error))
+            return {}
 
-            print("\n{0} encountered an error while loading live data. Trying to recover from cache!".format(type(self).__name__))
+        print("\n{0} {1}. Trying to recover from cache!".format(type(self).__name__, error))
 
-            # Terminate if not allow Failure
-            if not self.allowFailure:
-                sys.exit("\nExiting due to exchange importance on %s!" % type(self).__name__)
+        # Terminate if not allow Failure
+        if not self.allowFailure:
+            sys.exit("\nExiting due to exchange importance on %s!" % type(self).__name__)
 
         try:
             return self.recoverFromCache()
         except:
             print("We were unable to fetch live or cached data from %s. Skipping", type(self).__name__)
 
-    def today(self):
-        return datetime.datetime.strftime(datetime.datetime.now(), "%Y-%m-%d")
-
     def recoverFromCache(self):
-        cacheFile = self.getCacheFileName()
-        if os.path.isfile(cacheFile):
-            with open(self.getCacheFileName(), 'r') as fp:
-                return json.load(fp)
-        return {}
-
-    def getCacheFileName(self):
-        cacheDir = os.path.join(
-            user_data_dir("bitshares_pricefeed", "ChainSquad GmbH"),
-            "cache",
-            type(self).__name__
-        )
-        if not os.path.exists(cacheDir):
-            os.makedirs(cacheDir)
-        return os.path.join(cacheDir, self.today() + ".json")
+        """ Last cached feed, if not older than ``cacheMaxStaleness``
+        """
+        cached = self.cache.load(self.fingerprint(), max_age=self.cacheMaxStaleness)
+        if not cached:
+            return {}
+        feed, age = cached
+        print("Recovered {0} from a cached feed {1:.0f}s old".format(type(self).__name__, age))
+        return feed
 
     def updateCache(self, feed):
-        with open(self.getCacheFileName(), 'w') as fp:
-            json.dump(feed, fp)
+        if feed:
+            self.cache.store(self.fingerprint(), feed)
 
     def alias(self, symbol):
         if  symbol in self.aliases:
@@ -1,20 +1,22 @@
-import requests
+import asyncio
 from . import FeedSource, _request_headers
 
 # pylint: disable=no-member
 class OpenExchangeRates(FeedSource):  # Hourly updated data with free subscription
+    pair_scoped = True
+    conditional = True
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         if not hasattr(self, "api_key") or not hasattr(self, "free_subscription"):
             raise Exception("OpenExchangeRates FeedSource requires 'api_key' and 'free_subscription'")
 
-    def _fetch(self):
+    async def _fetch_async(self):
         feed = {}
-        for base in self.bases:
-            url = "https://openexchangerates.org/api/latest.json?app_id=%s&base=%s" % (self.api_key, base)
-            if self.free_subscription and base != 'USD':
-                continue
-            response = requests.get(url=url, headers=_request_headers, timeout=self.timeout)
+        url = "https://openexchangerates.org/api/latest.json?app_id=%s&base=%s"
+        bases = [base for base in self.bases if not (self.free_subscription and base != 'USD')]
+        responses = await asyncio.gather(*[self._get_async(url % (self.api_key, base)) for base in bases])
+        for base, response in zip(bases, responses):
             result = response.json()
             if result.get("base") != base:
                 raise Exception("Error fetching from url. Returned: {}".format(result))
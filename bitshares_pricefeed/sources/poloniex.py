@@ -1,13 +1,15 @@
-import requests
+import asyncio
 from datetime import timedelta, datetime
 from . import FeedSource, _request_headers
 
 
 class Poloniex(FeedSource):
+    pair_scoped = True
+
     def _fetch(self):
         feed = {}
         url = "https://poloniex.com/public?command=returnTicker"
-        response = requests.get(url=url, headers=_request_headers, timeout=self.timeout)
+        response = self.http.get(url, headers=_request_headers, timeout=self.timeout)
         result = response.json()
         feed["response"] = result
         for base in self.bases:
@@ -20,21 +22,22 @@ class Poloniex(FeedSource):
         return feed
 
 class PoloniexVWAP(FeedSource):
+    pair_scoped = True
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.period = getattr(self, "period", 900)
 
-    def _fetch(self):
+    async def _fetch_async(self):
         feed = {}
         start_date = datetime.utcnow() - timedelta(hours=1)
-        for base in self.bases:
-            for quote in self.quotes:
-                if quote == base:
-                    continue
-                url = "https://poloniex.com/public?command=returnChartData&currencyPair={}_{}&start={}&end=9999999999&period={}".format(base, quote, start_date.timestamp(), self.period)
-                response = requests.get(url=url, headers=_request_headers, timeout=self.timeout)
-                result = response.json()
-                vwap = result[-1]
-                self.add_rate(feed, base, quote, vwap["weightedAverage"], vwap["quoteVolume"])
+        url = "https://poloniex.com/public?command=returnChartData&currencyPair={}_{}&start={}&end=9999999999&period={}"
+        pairs = self.pairs()
+        responses = await asyncio.gather(*[
+            self._get_async(url.format(base, quote, start_date.timestamp(), self.period)) for base, quote in pairs])
+        for (base, quote), response in zip(pairs, responses):
+            result = response.json()
+            vwap = result[-1]
+            self.add_rate(feed, base, quote, vwap["weightedAverage"], vwap["quoteVolume"])
         print(feed)
         return feed
@@ -1,7 +1,6 @@
+import asyncio
 import datetime
-import requests
 from . import FeedSource, _request_headers
-import quandl
 
 # pylint: disable=no-member
 class Quandl(FeedSource):  # Quandl using Python API client
@@ -9,10 +8,13 @@ class Quandl(FeedSource):  # Quandl using Python API client
         super().__init__(*args, **kwargs)
         self.maxAge = getattr(self, "maxAge", 5)
 
+        # The client pulls in pandas, import it only when it is used
+        import quandl
         quandl.ApiConfig.api_key = self.api_key
         quandl.ApiConfig.api_version = '2015-04-09'
 
     def _fetch(self): 
+        import quandl
         feed = {}
         for market in self.datasets:
             quote, base = market.split(":")
@@ -23,26 +25,32 @@ class Quandl(FeedSource):  # Quandl using Python API client
 
 
 class QuandlPlain(FeedSource):  # Quandl direct HTTP
+    conditional = True
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.maxAge = getattr(self, "maxAge", 5)
 
-    def _fetch(self):
+    def _dataset_url(self, dataset):
+        url = "https://www.quandl.com/api/v3/datasets/{dataset}.json?start_date={date}".format(
+            dataset=dataset,
+            date=datetime.datetime.strftime(datetime.datetime.now() -
+                                            datetime.timedelta(days=self.maxAge),
+                                            "%Y-%m-%d")
+        )
+        if hasattr(self, "api_key"):
+            url += "&api_key=%s" % self.api_key
+        return url
+
+    async def _fetch_async(self):
         feed = {}
 
         for market in self.datasets:
             quote, base = market.split(":")
             prices = []
-            for dataset in self.datasets[market]:
-                url = "https://www.quandl.com/api/v3/datasets/{dataset}.json?start_date={date}".format(
-                    dataset=dataset,
-                    date=datetime.datetime.strftime(datetime.datetime.now() -
-                                                    datetime.timedelta(days=self.maxAge),
-                                                    "%Y-%m-%d")
-                )
-                if hasattr(self, "api_key"):
-                    url += "&api_key=%s" % self.api_key
-                response = requests.get(url=url, headers=_request_headers, timeout=self.timeout)
+            urls = [self._dataset_url(dataset) for dataset in self.datasets[market]]
+            responses = await asyncio.gather(*[self._get_async(url) for url in urls])
+            for url, response in zip(urls, responses):
                 data = response.json()
                 if "quandl_error" in data:
                     raise Exception(data["quandl_error"]["message"])
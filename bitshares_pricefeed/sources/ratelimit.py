@@ -0,0 +1,136 @@
+import os
+import threading
+import time
+
+from appdirs import user_data_dir
+
+from .state import Shared, load_json, save_json
+
+import logging
+log = logging.getLogger(__name__)
+
+_shared_rate_limiter = Shared(lambda: RateLimiter())
+
+
+class QuotaExceeded(Exception):
+    pass
+
+
+class TokenBucket(object):
+    """ Allow ``rate`` requests every ``per`` seconds, with bursts of up
+        to ``burst`` requests
+
+        :meth:`reserve` always takes a token, possibly one that is only
+        refilled in the future, and returns how long the caller has to
+        wait for it. Concurrent callers are thus spread evenly instead of
+        all being released at once.
+    """
+    def __init__(self, rate, per=1.0, burst=None):
+        self.interval = float(per) / rate
+        self.capacity = burst or rate
+        self.tokens = self.capacity
+        self.stamp = time.monotonic()
+        self.lock = threading.Lock()
+
+    def reserve(self):
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.stamp) / self.interval)
+            self.stamp = now
+            self.tokens -= 1
+            return max(0, -self.tokens * self.interval)
+
+
+class RateLimiter(object):
+    """ Token buckets and request quotas shared by all sources using the
+        same key: the host of the requests, unless a ``key`` is
+        configured
+
+        A source's ``rateLimit`` setting configures its key::
+
+            rateLimit:
+                rate: 5            # requests ...
+                per: 60            # ... per this many seconds
+                burst: 5           # requests allowed at once, default rate
+                quota: 500         # requests ...
+                quotaPeriod: 86400 # ... per this many seconds
+                key: alphavantage  # account on this key, not the host
+
+        Quota consumption is persisted in ``state_file`` so that it
+        survives restarts; :meth:`save` writes it. The keys the requests
+        of each source were accounted on are only kept in memory.
+
+        :param str state_file: where to persist quota consumption,
+            defaults to the user data directory
+    """
+    def __init__(self, state_file=None):
+        self.state_file = state_file or os.path.join(
+            user_data_dir("bitshares_pricefeed", "ChainSquad GmbH"), "quota.json")
+        self.buckets = {}
+        self.lock = threading.Lock()
+        self.quotas = load_json(self.state_file, {})
+        self.keys = {}
+
+    def note(self, owner, key):
+        """ Record that a request of ``owner`` was accounted on ``key``
+        """
+        with self.lock:
+            self.keys.setdefault(owner, set()).add(key)
+
+    def keys_of(self, owner):
+        """ Keys the requests of ``owner`` were accounted on so far
+        """
+        with self.lock:
+            return sorted(self.keys.get(owner, ()))
+
+    def remaining(self, key, settings):
+        """ Requests left in the current quota period, ``None`` if
+            unlimited
+        """
+        if not settings.get("quota"):
+            return None
+        with self.lock:
+            return settings["quota"] - self._usage(key, settings)["used"]
+
+    def _usage(self, key, settings):
+        usage = self.quotas.setdefault(key, {"start": time.time(), "used": 0})
+        if time.time() - usage["start"] >= settings.get("quotaPeriod", 24 * 3600):
+            usage.update(start=time.time(), used=0)
+        return usage
+
+    def acquire(self, key, settings):
+        """ Account for one request and return the delay, in seconds, to
+            wait before sending it
+
+            :raises QuotaExceeded: when the quota of ``key`` is used up
+        """
+        with self.lock:
+            if settings.get("quota"):
+                usage = self._usage(key, settings)
+                if usage["used"] >= settings["quota"]:
+                    raise QuotaExceeded("Request quota of %s exhausted" % key)
+                usage["used"] += 1
+            if not settings.get("rate"):
+                return 0
+            if key not in self.buckets:
+                self.buckets[key] = TokenBucket(
+                    settings["rate"], settings.get("per", 1.0), settings.get("burst"))
+        return self.buckets[key].reserve()
+
+    def save(self):
+        """ Atomically persist quota consumption
+        """
+        with self.lock:
+            if not self.quotas:
+                return
+            save_json(self.state_file, self.quotas)
+
+
+def shared_rate_limiter():
+    """ The process wide limiter, used by sources created without one
+    """
+    return _shared_rate_limiter.get()
+
+
+def set_shared_rate_limiter(limiter):
+    _shared_rate_limiter.set(limiter)
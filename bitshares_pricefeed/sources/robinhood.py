@@ -1,4 +1,4 @@
-import requests
+import asyncio
 from . import FeedSource, _request_headers
 
 # pylint: disable=no-member
@@ -12,14 +12,14 @@ class RobinHood(FeedSource): # Stocks prices from RobinHood: https://github.com/
             symbols_by_base[base].append(symbol)
         return symbols_by_base
 
-    def _fetch(self):
+    async def _fetch_async(self):
         symbols_by_base = self._extract_symbols()
         feed = {}
         url = "https://api.robinhood.com/quotes/?symbols={symbols}"
-        for base in symbols_by_base.keys():
-            response = requests.get(url=url.format(
-                symbols=','.join(symbols_by_base[base])
-            ), headers=_request_headers, timeout=self.timeout)
+        bases = list(symbols_by_base.keys())
+        responses = await asyncio.gather(*[
+            self._get_async(url.format(symbols=','.join(symbols_by_base[base]))) for base in bases])
+        for base, response in zip(bases, responses):
             result = response.json()['results']
             for ticker in result:
                 self.add_rate(feed, base, ticker['symbol'], float(ticker["last_trade_price"]), 1.0)
@@ -1,4 +1,3 @@
-import requests
 from . import FeedSource, _request_headers
 import re
 
@@ -26,7 +25,7 @@ class Sina(FeedSource):
         feed = {}
         url = "http://hq.sinajs.cn/list="
         params = self.get_query_param(self.quotes)
-        response = requests.get(url=url+params, headers=_request_headers, timeout=self.timeout)
+        response = self.http.get(url+params, headers=_request_headers, timeout=self.timeout)
         
         price_info =dict(zip(self.quotes, response.text.splitlines()))
         for base in self.bases:
@@ -0,0 +1,68 @@
+import json
+import os
+import tempfile
+import threading
+
+
+def load_json(path, default=None):
+    """ Content of the JSON file ``path``, ``default`` if it is missing
+        or unreadable
+    """
+    try:
+        with open(path, "r") as fp:
+            return json.load(fp)
+    except (IOError, ValueError):
+        return default
+
+
+def write_atomic(path, write, mode="w"):
+    """ Atomically (write then rename) replace ``path``
+
+        :param str path: file to replace, its directory is created if
+            needed
+        :param write: called with the open temporary file
+        :param str mode: mode the temporary file is opened with
+
+        The temporary file is removed if ``write`` fails.
+    """
+    directory = os.path.dirname(path)
+    if not os.path.exists(directory):
+        os.makedirs(directory)
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, mode) as fp:
+            write(fp)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def save_json(path, data):
+    """ Atomically store ``data`` as JSON in ``path``
+    """
+    write_atomic(path, lambda fp: json.dump(data, fp))
+
+
+class Shared(object):
+    """ A process wide instance, created by ``factory`` on first use
+
+        :param factory: callable returning the default instance
+    """
+    def __init__(self, factory):
+        self.factory = factory
+        self.instance = None
+        self.lock = threading.Lock()
+
+    def get(self):
+        with self.lock:
+            if self.instance is None:
+                self.instance = self.factory()
+            return self.instance
+
+    def set(self, instance):
+        with self.lock:
+            self.instance = instance
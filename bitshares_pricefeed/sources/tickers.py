@@ -0,0 +1,152 @@
+import os
+import threading
+import time
+from concurrent import futures
+
+from appdirs import user_data_dir
+
+from .state import Shared, load_json, save_json
+
+import logging
+log = logging.getLogger(__name__)
+
+_shared_ticker_service = Shared(lambda: TickerService())
+
+
+class MarketIndex(object):
+    """ Which DEX markets have liquidity (a last price and volume)
+
+        Every fetched ticker updates the index. Markets found without
+        liquidity are skipped by the ``Graphene`` source until their
+        record is ``max_age`` seconds old, when they are checked again.
+
+        The records are persisted in ``state_file``; :meth:`save` writes
+        them.
+
+        :param str state_file: where to persist the records, defaults to
+            the user data directory
+        :param bool persist: load and save the records
+        :param float max_age: seconds a record is trusted
+    """
+    def __init__(self, state_file=None, persist=True, max_age=3600):
+        self.state_file = state_file or os.path.join(
+            user_data_dir("bitshares_pricefeed", "ChainSquad GmbH"), "markets.json")
+        self.persist = persist
+        self.max_age = max_age
+        self.lock = threading.Lock()
+        self.records = load_json(self.state_file, {}) if persist else {}
+
+    def liquid(self, market):
+        """ Has ``market`` liquidity? ``None`` if unknown or outdated
+        """
+        record = self.records.get(market.upper())
+        if not record or time.time() - record["checked"] > self.max_age:
+            return None
+        return record["liquid"]
+
+    def update(self, market, liquid):
+        with self.lock:
+            self.records[market.upper()] = {"liquid": bool(liquid), "checked": time.time()}
+
+    def save(self):
+        """ Atomically persist the records
+        """
+        with self.lock:
+            if not self.persist or not self.records:
+                return
+            save_json(self.state_file, self.records)
+
+
+class TickerService(object):
+    """ Memoised tickers of the DEX markets
+
+        :meth:`ticker` returns the ticker of a market (``QUOTE:BASE``, as
+        for :class:`bitshares.market.Market`) as long as it is younger
+        than ``ttl`` seconds, and fetches it otherwise. Concurrent
+        requests of the same market wait on a single fetch, so that a
+        ticker is never fetched twice within ``ttl``.
+
+        :meth:`prefetch` fetches several markets at once, on a pool of
+        ``max_workers`` threads. The calls of the threads run concurrently
+        over the nodes of a :class:`NodePool` spreading reads; a single
+        connection serves them one after the other.
+
+        :param float ttl: seconds a ticker is reused
+        :param int max_workers: threads fetching tickers concurrently
+        :param bitshares.BitShares blockchain_instance: node connection,
+            defaults to the shared instance
+        :param MarketIndex index: liquidity of the markets, updated with
+            every ticker fetched, defaults to an index kept in memory
+    """
+    def __init__(self, ttl=60, max_workers=8, blockchain_instance=None, index=None):
+        self.ttl = ttl
+        self.max_workers = max_workers
+        self.blockchain = blockchain_instance
+        self.index = index or MarketIndex(persist=False)
+        self.lock = threading.Lock()
+        self.tickers = {}
+        self.fetched = 0
+
+    def reset(self):
+        """ Forget all tickers
+        """
+        with self.lock:
+            self.tickers = {}
+
+    def ticker(self, market):
+        """ The ticker of ``market``, see :meth:`bitshares.market.Market.ticker`
+        """
+        market = market.upper()
+        with self.lock:
+            entry = self.tickers.get(market)
+            if entry and (not entry[0].done() or time.monotonic() - entry[1] < self.ttl):
+                future = entry[0]
+                owner = False
+            else:
+                future = futures.Future()
+                self.tickers[market] = (future, time.monotonic())
+                owner = True
+        if owner:
+            try:
+                future.set_result(self.fetch(market))
+            except Exception as e:
+                with self.lock:
+                    # Do not memoise failures
+                    if self.tickers.get(market, (None,))[0] is future:
+                        del self.tickers[market]
+                future.set_exception(e)
+        return future.result()
+
+    def fetch(self, market):
+        from bitshares.market import Market
+        self.fetched += 1
+        log.debug("Fetching ticker of %s", market)
+        if self.blockchain:
+            ticker = Market(market, blockchain_instance=self.blockchain).ticker()
+        else:
+            ticker = Market(market).ticker()
+        self.index.update(market, float(ticker["latest"]) > 0 and float(ticker["quoteVolume"]) > 0)
+        return ticker
+
+    def prefetch(self, markets):
+        """ Fetch the tickers of ``markets`` not memoised yet concurrently.
+            Markets failing to load are left to be fetched (and fail) when
+            used.
+        """
+        markets = list(dict.fromkeys(x.upper() for x in markets))
+        if not markets:
+            return
+        with futures.ThreadPoolExecutor(max_workers=min(self.max_workers, len(markets))) as pool:
+            for market, result in zip(markets, [pool.submit(self.ticker, x) for x in markets]):
+                if result.exception():
+                    log.warning("Ticker of %s unavailable: %s", market, result.exception())
+
+
+def shared_ticker_service():
+    """ The process wide ticker service, used by sources created without one
+    """
+    return _shared_ticker_service.get()
+
+
+def set_shared_ticker_service(service):
+    _shared_ticker_service.set(service)
@@ -1,20 +1,22 @@
-import requests
+import asyncio
 from . import FeedSource, _request_headers
 
 # pylint: disable=no-member
 class WorldCoinIndex(FeedSource):  # Weighted average from WorldCoinIndex 
+    pair_scoped = True
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.timeout = getattr(self, 'timeout', 15)
         if not hasattr(self, 'api_key'):
             raise Exception("WorldCoinIndex FeedSource requires 'api_key'.")
 
-    def _fetch(self):
+    async def _fetch_async(self):
         feed = {}
-        for base in self.bases:
-            url = "https://www.worldcoinindex.com/apiservice/v2getmarkets?key={apikey}&fiat={base}"
-            response = requests.get(url=url.format(apikey=self.api_key, base=base),
-                                    headers=_request_headers, timeout=self.timeout)
+        url = "https://www.worldcoinindex.com/apiservice/v2getmarkets?key={apikey}&fiat={base}"
+        responses = await asyncio.gather(*[
+            self._get_async(url.format(apikey=self.api_key, base=base)) for base in self.bases])
+        for base, response in zip(self.bases, responses):
             result = response.json()['Markets']
             for market in result:
                 for ticker in market:
@@ -0,0 +1,82 @@
+import numpy as num
+
+# Scale of the median absolute deviation to the std of a normal distribution
+MAD_SCALE = 1.4826
+
+METRICS = ("median", "mean", "weighted", "weighted_median", "trimmed", "winsorized")
+
+
+def weighted_std(values, weights):
+    """ Weighted std for statistical reasons
+    """
+    average = num.average(values, weights=weights)
+    variance = num.average((values - average) ** 2, weights=weights)  # Fast and numerically precise
+    return float(num.sqrt(variance))
+
+
+def reject_outliers(prices, threshold):
+    """ Mask of the prices within ``threshold`` median absolute
+        deviations (scaled to a std) of the median. All prices are kept
+        when most of them are equal, i.e. the deviation is zero.
+    """
+    median = num.median(prices)
+    deviations = num.abs(prices - median)
+    mad = num.median(deviations) * MAD_SCALE
+    if not mad > 0:
+        return num.ones(len(prices), dtype=bool)
+    return deviations <= threshold * mad
+
+
+def summarize(prices, volumes, trim=0.1, outlier_threshold=None):
+    """ Statistics of prices and their volumes, in one pass over the
+        sorted arrays
+
+        :param prices: prices, e.g. one per route
+        :param volumes: volumes of the prices, weights of the volume
+            weighted statistics. Equal weights are used when they are
+            all zero.
+        :param float trim: fraction of the prices cut (``trimmed``) or
+            clipped (``winsorized``) at each end
+        :param float outlier_threshold: if given, prices further than that
+            many median absolute deviations from the median are rejected
+            before any other statistic is computed
+        :returns: a dict with the ``mean``, ``median``, ``weighted``
+            (mean), ``weighted_median``, ``trimmed`` (mean),
+            ``winsorized`` (mean), ``std`` (volume weighted), the
+            ``number`` of prices used and the number ``rejected``, None
+            if there are no prices.
+    """
+    prices = num.asarray(prices, dtype=num.float64)
+    volumes = num.asarray(volumes, dtype=num.float64)
+    number = len(prices)
+    if not number:
+        return
+
+    if outlier_threshold is not None and number > 2:
+        keep = reject_outliers(prices, outlier_threshold)
+        prices, volumes = prices[keep], volumes[keep]
+
+    order = num.argsort(prices, kind="mergesort")
+    prices, volumes = prices[order], volumes[order]
+    n = len(prices)
+    if not volumes.sum() > 0:
+        volumes = num.ones(n)
+
+    weighted = float(num.average(prices, weights=volumes))
+    cumulated = num.cumsum(volumes)
+    middle = min(int(num.searchsorted(cumulated, cumulated[-1] / 2.0)), n - 1)
+    cut = int(n * trim)
+    if 2 * cut >= n:
+        cut = (n - 1) // 2
+
+    return {
+        "mean": float(prices.mean()),
+        "median": float((prices[(n - 1) // 2] + prices[n // 2]) / 2),
+        "weighted": weighted,
+        "weighted_median": float(prices[middle]),
+        "trimmed": float(prices[cut:n - cut].mean()),
+        "winsorized": float(num.clip(prices, prices[cut], prices[n - 1 - cut]).mean()),
+        "std": weighted_std(prices, volumes) if n > 1 else 0,
+        "number": n,
+        "rejected": number - n,
+    }
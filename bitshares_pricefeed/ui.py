@@ -5,11 +5,12 @@ import yaml
 from math import fabs
 from datetime import datetime, timezone
 from bitshares.price import Price
-from bitshares.asset import Asset
 from prettytable import PrettyTable
 from functools import update_wrapper
 from bitshares import BitShares
 from bitshares.instance import set_shared_bitshares_instance
+from uptick.decorators import verbose
+from .nodes import NodePool
 log = logging.getLogger(__name__)
 
 
@@ -21,6 +22,32 @@ def configfile(f):
     return update_wrapper(new_func, f)
 
 
+def chain(f):
+    """ Like uptick's ``chain``, giving access to ``ctx.bitshares``, but
+        connected through a :class:`NodePool` of the nodes given with
+        ``--node`` or in the ``nodes`` section of the configuration
+    """
+    @click.pass_context
+    @verbose
+    def new_func(ctx, *args, **kwargs):
+        settings = dict(getattr(ctx, "config", None) and ctx.config.get("nodes") or {})
+        if ctx.obj.get("node"):
+            settings["urls"] = ctx.obj["node"]
+        options = dict(ctx.obj)
+        if settings.get("urls"):
+            # Connected by the pool
+            options.update(node=None, offline=True)
+            ctx.bitshares = BitShares(**options)
+            ctx.bitshares.rpc = NodePool(**settings)
+            ctx.bitshares.offline = False
+        else:
+            ctx.bitshares = BitShares(**options)
+        ctx.blockchain = ctx.bitshares
+        set_shared_bitshares_instance(ctx.bitshares)
+        return ctx.invoke(f, *args, **kwargs)
+    return update_wrapper(new_func, f)
+
+
 def priceChange(new, old):
     if float(old) == 0.0:
         return -1
@@ -59,16 +86,14 @@ def print_log(feeds):
     ])
     t.align = 'l'
     for symbol, feed in feeds.items():
-        asset = Asset(symbol, full=True)
-        asset.ensure_full()
-        short_backing_asset = Asset(
-            asset["bitasset_data"]["options"]["short_backing_asset"])
-        backing_symbol = short_backing_asset["symbol"]
-        data = feed.get("log", {})
-        price = data.get(symbol)
-        if not price:
+        # The backing asset was read from the chain snapshot while deriving
+        if not feed:
+            continue
+        backing_symbol = feed["short_backing_symbol"]
+        data = feed.get("log")
+        if not data or symbol not in data:
             continue
-        for d in price.get(backing_symbol, []):
+        for d in data.entries(symbol, backing_symbol):
             t.add_row([
                 symbol,
                 backing_symbol,
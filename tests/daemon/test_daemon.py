@@ -0,0 +1,68 @@
+from bitshares_pricefeed.daemon import Daemon
+
+
+class FakeFeed(object):
+    config = {
+        'exchanges': {
+            'fast': {},
+            'slow': {'fetchInterval': '1h'},
+            'disabled': {'enable': False},
+        },
+    }
+
+    def __init__(self):
+        self.fetches = []
+        self.runs = 0
+
+    def new_run(self):
+        self.runs += 1
+
+    def fetch(self, names=None, assets=None):
+        assert assets == ['USD']
+        self.new_run()
+        self.fetches.append(sorted(names))
+
+    def derive(self, assets):
+        if len(self.fetches) == 3:
+            raise ValueError('node lost')
+        return {'USD': {'price': len(self.fetches)}}
+
+
+def test_daemon_cycles():
+    feed = FakeFeed()
+    published = []
+
+    def publish(prices):
+        published.append(prices['USD']['price'])
+        if len(published) == 3:
+            daemon.stop()
+
+    daemon = Daemon(feed, publish, interval=0, assets=['USD'])
+    daemon.run()
+    # The slow exchange is fetched once, a failing cycle does not stop
+    # the daemon
+    assert feed.fetches == [['fast', 'slow'], ['fast'], ['fast'], ['fast']]
+    assert published == [1, 2, 4]
+    assert daemon.cycles == 3
+
+
+class SlowFeed(FakeFeed):
+    config = {'exchanges': {'slow': {'fetchInterval': '1h'}}}
+
+    def derive(self, assets):
+        return {'USD': {'price': self.runs}}
+
+
+def test_daemon_reads_the_chain_every_cycle():
+    feed = SlowFeed()
+    published = []
+
+    def publish(prices):
+        published.append(prices['USD']['price'])
+        if len(published) == 3:
+            daemon.stop()
+
+    daemon = Daemon(feed, publish, interval=0, assets=['USD'])
+    daemon.run()
+    assert feed.fetches == [['slow']]
+    assert published == [1, 2, 3]
@@ -0,0 +1,47 @@
+from bitshares_pricefeed.cli import publish
+
+
+class FakeTxBuffer(object):
+    def __init__(self):
+        self.ops = []
+        self.broadcasts = 0
+
+    def clear(self):
+        self.ops = []
+
+    def constructTx(self):
+        pass
+
+    def json(self):
+        return {'operations': self.ops}
+
+    def broadcast(self):
+        self.broadcasts += 1
+
+
+class FakeBitShares(object):
+    def __init__(self):
+        self.txbuffer = FakeTxBuffer()
+
+    def publish_price_feed(self, symbol, **kwargs):
+        self.txbuffer.ops.append(symbol)
+
+
+class FakeContext(object):
+    def __init__(self):
+        self.bitshares = FakeBitShares()
+        self.config = {'producer': 'init0'}
+
+
+def test_publish_without_confirmation_skips_warnings(capsys):
+    ctx = FakeContext()
+    prices = {
+        'USD': {'flags': ['min_change', 'over_warn_change'], 'priceChange': 2.0},
+        'CNY': {'flags': ['min_change', 'over_warn_change', 'skip_change'], 'priceChange': 5.0},
+    }
+    assert publish(ctx, prices, interactive=False) == 1
+    assert ctx.bitshares.txbuffer.ops == []
+    assert ctx.bitshares.txbuffer.broadcasts == 0
+    err = capsys.readouterr().err
+    assert "USD (2.000000) has been above 'warn_change'.  Skipping!" in err
+    assert "CNY (5.000000) has been above 'skip_change'.  Skipping!" in err
@@ -0,0 +1,80 @@
+import pytest
+
+from bitshares_pricefeed.graph import DependencyIndex
+from bitshares_pricefeed.pricefeed import Feed
+from bitshares_pricefeed.sources import TickerService
+
+feed = {
+    'binance': {'BTC': {'BTS': {'price': 0.00001, 'volume': 1000.0}}},
+    'kraken': {'USD': {'BTC': {'price': 10000.0, 'volume': 2.0}}, 'EUR': {'BTC': {'price': 9000.0, 'volume': 1.0}}},
+    'bitstamp': {'USD': {'BTC': {'price': 10100.0, 'volume': 1.0}}},
+    'ecb': {'EUR': {'USD': {'price': 0.9, 'volume': 1.0}}},
+    'aex': {'CNY': {'BTS': {'price': 15.0, 'volume': 10.0}}},
+}
+config = {
+    'assets': {'USD': None, 'EUR': None, 'CNY': None},
+    'default': {
+        'sources': ['*'], 'metric': 'weighted', 'derive_across_3markets': True,
+        'maximum_short_squeeze_ratio': 110, 'maintenance_collateral_ratio': 175},
+    'intermediate_assets': ['BTC', 'USD'],
+    'exchanges': {name: {} for name in feed},
+}
+
+
+class OfflineFeed(Feed):
+    """ Feed deriving prices without querying the chain
+    """
+    def __init__(self, config):
+        self.config = config
+        self.feed = dict(feed)
+        self.graph = None
+        self.tickers = TickerService()
+        self.derived = {}
+        self.dependencies = DependencyIndex()
+        self.derived_prices = []
+
+    def derive_prices(self, symbol, backing_symbol):
+        self.derived_prices.append(symbol)
+        return super().derive_prices(symbol, backing_symbol)
+
+    def take_snapshot(self, symbols):
+        pass
+
+    def prefetch_tickers(self, symbols):
+        pass
+
+    def get_backing_asset(self, symbol):
+        return {'short_backing_asset': {'symbol': 'BTS'}}
+
+    def compute_target_price(self, symbol, backing_symbol, real_price):
+        return 0, real_price, {}
+
+    def get_cer(self, symbol, price, asset):
+        return price
+
+    def obtain_price_change(self, symbol):
+        self.price_result[symbol]['priceChange'] = 0
+
+    def obtain_flags(self, symbol):
+        pass
+
+
+def summary(prices):
+    return {
+        symbol: (price['price'], price['number'], price['log'].entries(symbol, 'BTS'))
+        for symbol, price in prices.items()}
+
+
+class Offline:
+    """ Prices fetched from a few exchanges and a feed deriving them
+        without querying the chain
+    """
+    feed = feed
+    config = config
+    Feed = OfflineFeed
+    summary = staticmethod(summary)
+
+
+@pytest.fixture
+def offline():
+    return Offline
@@ -0,0 +1,98 @@
+from bitshares_pricefeed.chain import ChainSnapshot
+
+
+def asset(id, symbol, bitasset_data_id=None):
+    data = {
+        'id': id, 'symbol': symbol, 'precision': 4, 'issuer': '1.2.0',
+        'dynamic_asset_data_id': '2.3.' + id.split('.')[2],
+        'options': {'flags': 0, 'issuer_permissions': 0, 'description': ''},
+    }
+    if bitasset_data_id:
+        data['bitasset_data_id'] = bitasset_data_id
+    return data
+
+
+def price(base, quote):
+    return {'base': {'amount': base, 'asset_id': '1.3.1'}, 'quote': {'amount': quote, 'asset_id': '1.3.0'}}
+
+
+def feed(producer, amount):
+    return [producer, ['2020-01-01T00:00:00', {
+        'settlement_price': price(1, amount), 'core_exchange_rate': price(1, amount),
+        'maintenance_collateral_ratio': 1750, 'maximum_short_squeeze_ratio': 1100}]]
+
+
+objects = {
+    '1.3.0': asset('1.3.0', 'TEST'),
+    '1.3.1': asset('1.3.1', 'USD', '2.4.1'),
+    '1.3.2': asset('1.3.2', 'OPEN.BTC'),
+    '2.3.1': {'id': '2.3.1', 'current_supply': 0},
+    '2.3.2': {'id': '2.3.2', 'current_supply': 0},
+    '2.4.1': {
+        'id': '2.4.1', 'options': {'short_backing_asset': '1.3.0'},
+        'current_feed': {
+            'settlement_price': price(1, 20), 'core_exchange_rate': price(1, 20),
+            'maintenance_collateral_ratio': 1750, 'maximum_short_squeeze_ratio': 1100},
+        'feeds': [feed('1.2.5', 30), feed('1.2.7', 10)],
+    },
+}
+
+
+class RPC(object):
+    def __init__(self):
+        self.calls = []
+
+    def lookup_asset_symbols(self, symbols):
+        self.calls.append('lookup_asset_symbols')
+        by_symbol = dict((x['symbol'], x) for x in objects.values() if 'symbol' in x)
+        return [dict(by_symbol[x]) if x in by_symbol else None for x in symbols]
+
+    def get_objects(self, ids):
+        self.calls.append('get_objects')
+        return [dict(objects[x]) for x in ids]
+
+
+class Chain(object):
+    def __init__(self):
+        self.rpc = RPC()
+
+
+def test_snapshot_round_trips():
+    chain = Chain()
+    snapshot = ChainSnapshot(['USD', 'OPEN.BTC', 'MISSING'], producer='1.2.7', blockchain_instance=chain)
+    assert chain.rpc.calls == ['lookup_asset_symbols', 'get_objects', 'get_objects']
+    usd = snapshot.asset('USD')
+    assert usd.is_bitasset
+    assert usd['bitasset_data']['id'] == '2.4.1'
+    assert snapshot.backing_asset('USD')['symbol'] == 'TEST'
+    assert snapshot.backing_asset('OPEN.BTC') is None
+    assert snapshot.current_feed('USD')['maintenance_collateral_ratio'] == 1750
+    assert float(snapshot.current_feed('USD')['settlement_price']) == 0.1
+    assert snapshot.current_feed('OPEN.BTC') is None
+    # Everything above was read from the snapshot
+    assert len(chain.rpc.calls) == 3
+
+
+def test_snapshot_missing_asset():
+    chain = Chain()
+    snapshot = ChainSnapshot(producer='1.2.7', blockchain_instance=chain)
+    try:
+        snapshot.asset('MISSING')
+        assert False
+    except Exception as e:
+        assert 'MISSING' in str(e)
+    # Not looked up again
+    snapshot.load(['MISSING'])
+    assert chain.rpc.calls == ['lookup_asset_symbols']
+
+
+def test_bitsharesfeed_reads_the_snapshot():
+    from bitshares_pricefeed.sources import BitsharesFeed
+    chain = Chain()
+    snapshot = ChainSnapshot(producer='1.2.7', blockchain_instance=chain)
+    feed = BitsharesFeed(assets=['USD'], snapshot=snapshot).fetch()
+    assert feed['USD']['TEST']['price'] == 0.05
+    assert chain.rpc.calls == ['lookup_asset_symbols', 'get_objects', 'get_objects']
+    # Deriving later on reads the same snapshot
+    snapshot.load(['USD'])
+    assert len(chain.rpc.calls) == 3
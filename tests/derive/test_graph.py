@@ -0,0 +1,59 @@
+from bitshares_pricefeed.graph import PriceGraph, PriceStore
+
+feed = {
+    'binance': {'BTC': {'BTS': {'price': 0.00001, 'volume': 1000.0}}},
+    'kraken': {
+        'USD': {'BTC': {'price': 10000.0, 'volume': 2.0}, 'ETH': {'price': 200.0, 'volume': 0.0}},
+        'response': {},
+    },
+    'disabled': {'USD': {'BTC': {'price': 1.0, 'volume': 1.0}}},
+}
+exchanges = {'binance': {}, 'kraken': {}, 'disabled': {'enable': False}}
+
+
+def test_graph_edges():
+    graph = PriceGraph(feed, exchanges)
+    assert 'disabled' not in graph.datasources.ids
+    view = graph.view(['binance', 'kraken', 'disabled'])
+    assert view.entries('BTC', 'BTS') == [{'price': 0.00001, 'volume': 1000.0, 'sources': ['binance - BTC:BTS']}]
+    # Inverted edge, volume at spot price
+    assert view.prices('BTS', 'BTC').tolist() == [1.0 / 0.00001]
+    assert view.volumes('BTS', 'BTC').tolist() == [1000.0 * 0.00001]
+    assert view.sources('BTS', 'BTC') == [['binance - BTS:BTC']]
+    # Markets without volume are skipped
+    assert view.quotes('USD') == {'BTC'}
+
+
+def test_graph_views_are_shared():
+    graph = PriceGraph(feed, exchanges)
+    assert graph.view(['binance', 'kraken']) is graph.view(['kraken', 'binance'])
+    assert 'USD' not in graph.view(['binance'])
+    assert len(graph.view(['binance']).prices('USD', 'BTC')) == 0
+
+
+def test_store_on_top_of_view():
+    graph = PriceGraph(feed, exchanges)
+    view = graph.view(['binance', 'kraken'])
+    store = PriceStore(parent=view)
+    store.add('USD', 'BTC', 0.0001, 1.0, ['manual - USD:BTC'])
+    store.add_many('USD', 'BTS', [1.0, 2.0], [3.0, 4.0], [['a'], ['b']])
+    assert store.prices('USD', 'BTC').tolist() == [10000.0, 0.0001]
+    assert store.sources('USD', 'BTC') == [['kraken - USD:BTC'], ['manual - USD:BTC']]
+    assert store.entries('USD', 'BTS')[1] == {'price': 2.0, 'volume': 4.0, 'sources': ['b']}
+    assert store.quotes('USD') == {'BTC', 'BTS'}
+    # The shared view is left untouched
+    assert view.prices('USD', 'BTC').tolist() == [10000.0]
+    assert view.quotes('USD') == {'BTC'}
+
+
+def test_provenance_is_interned():
+    graph = PriceGraph(feed, exchanges)
+    view = graph.view(['binance', 'kraken'])
+    store = PriceStore(parent=view)
+    store.add_many('BTS', 'USD', [0.1], [1.0], [view.paths('BTS', 'BTC')[0] + view.paths('BTC', 'USD')[0]])
+    path = store.paths('BTS', 'USD')[0]
+    assert all(isinstance(x, int) for x in path)
+    assert store.sources('BTS', 'USD') == [['binance - BTS:BTC', 'kraken - BTC:USD']]
+    # The same path is only stored once
+    store.add_many('BTS', 'USD', [0.2], [1.0], [path])
+    assert len(set(store.column('path', 'BTS', 'USD').tolist())) == 1
@@ -0,0 +1,22 @@
+def test_derive_incremental(offline):
+    prices = offline.Feed(offline.config)
+    first = offline.summary(prices.derive())
+    assert prices.derived_prices == ['CNY', 'EUR', 'USD']
+    # Unchanged feeds, nothing to derive again
+    prices.update_feeds({'ecb': offline.feed['ecb'], 'aex': offline.feed['aex']})
+    assert offline.summary(prices.derive()) == first
+    assert prices.derived_prices == ['CNY', 'EUR', 'USD']
+    # Only CNY reads the CNY:BTS market
+    prices.update_feeds({'aex': {'CNY': {'BTS': {'price': 16.0, 'volume': 10.0}}}})
+    second = offline.summary(prices.derive())
+    assert prices.derived_prices == ['CNY', 'EUR', 'USD', 'CNY']
+    assert second['CNY'][0] == 16.0
+    assert second['USD'] == first['USD']
+    # EUR goes through USD:BTC, USD reads it directly
+    prices.update_feeds({'bitstamp': {'USD': {'BTC': {'price': 10200.0, 'volume': 1.0}}}})
+    third = offline.summary(prices.derive())
+    assert sorted(prices.derived_prices[4:]) == ['EUR', 'USD']
+    assert third != second
+    fresh = offline.Feed(offline.config)
+    fresh.feed = dict(prices.feed)
+    assert third == offline.summary(fresh.derive())
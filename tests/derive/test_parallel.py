@@ -0,0 +1,7 @@
+def test_derive_parallel(offline):
+    serial = offline.summary(offline.Feed(offline.config).derive())
+    parallel = offline.summary(offline.Feed(dict(offline.config, derive_workers=2)).derive())
+    assert serial == parallel
+    assert serial['USD'][1] == 2
+    # EUR:BTC -> BTC:BTS and EUR:USD -> USD:BTC -> BTC:BTS
+    assert serial['EUR'][1] == 3
@@ -0,0 +1,51 @@
+import pytest
+from bitshares_pricefeed.graph import PriceStore, RouteFinder
+
+
+def describe(store, path):
+    return [store.provenance.describe_edge(x) for x in path]
+
+
+@pytest.fixture
+def store():
+    store = PriceStore()
+    store.add_many('XAF', 'EUR', [0.0015], [1000.0], [['ecb']])
+    store.add_many('EUR', 'USD', [1.1, 1.2], [10.0, 1.0], [['a'], ['b']])
+    store.add_many('USD', 'BTC', [0.0001], [5.0], [['c']])
+    store.add_many('BTC', 'BTS', [20000.0, 21000.0], [2.0, 0.5], [['d'], ['e']])
+    store.add_many('EUR', 'BTS', [30.0], [3.0], [['f']])
+    return store
+
+
+def test_routes_n_hops(store):
+    routes = RouteFinder(store, ['EUR', 'USD', 'BTC'], max_hops=4).routes('XAF', 'BTS')
+    assert [x.symbols for x in routes] == [['XAF', 'EUR', 'BTS'], ['XAF', 'EUR', 'USD', 'BTC', 'BTS']]
+    four = routes[1]
+    assert len(four.prices) == 4
+    assert four.prices[0] == pytest.approx(0.0015 * 1.1 * 0.0001 * 20000.0)
+    # Weighted by the volume of the target market
+    assert four.volumes.tolist() == [2.0, 0.5, 2.0, 0.5]
+    assert describe(store, four.paths[3]) == ['ecb', 'b', 'c', 'e']
+
+
+def test_routes_max_hops(store):
+    routes = RouteFinder(store, ['EUR', 'USD', 'BTC'], max_hops=3).routes('XAF', 'BTS')
+    assert [x.symbols for x in routes] == [['XAF', 'EUR', 'BTS']]
+
+
+def test_routes_pruning(store):
+    finder = RouteFinder(store, ['EUR', 'USD', 'BTC'], max_hops=4, min_volume=1.0, fan_out=1)
+    four = finder.routes('XAF', 'BTS')[1]
+    assert [describe(store, x) for x in four.paths] == [['ecb', 'a', 'c', 'd']]
+
+    finder = RouteFinder(store, ['EUR', 'USD', 'BTC'], max_hops=4, max_routes=2)
+    routes = finder.routes('XAF', 'BTS')
+    assert sum(len(x.prices) for x in routes) == 2
+    assert [describe(store, x) for x in routes[0].paths] == [['ecb', 'f']]
+    assert [describe(store, x) for x in routes[1].paths] == [['ecb', 'a', 'c', 'd']]
+
+
+def test_routes_deduplicated(store):
+    routes = RouteFinder(store, ['EUR', 'EUR'], max_hops=2).routes('XAF', 'BTS')
+    assert len(routes) == 1
+    assert len(routes[0].prices) == 1
@@ -0,0 +1,32 @@
+def test_select_exchanges(offline):
+    exchanges = {
+        'binance': {'klass': 'Binance', 'bases': ['BTC'], 'quotes': ['BTS']},
+        'kraken': {'klass': 'Kraken', 'bases': ['USD', 'EUR'], 'quotes': ['BTC']},
+        'aex': {'klass': 'Aex', 'bases': ['CNY'], 'quotes': ['BTS']},
+        'fixer': {'klass': 'Fixer', 'bases': ['USD'], 'quotes': ['CNY', 'EUR']},
+        'manual': {'klass': 'Manual', 'feed': {}},
+        'quandl': {'klass': 'Quandl', 'enable': False},
+    }
+    prices = offline.Feed(dict(offline.config, exchanges=exchanges))
+    assert prices.select_exchanges(['USD']) == ['binance', 'kraken', 'manual']
+    assert prices.select_exchanges(['CNY']) == ['aex', 'binance', 'fixer', 'kraken', 'manual']
+    # USD:BTC is only a leg of CNY:USD -> USD:BTC -> BTC:BTS
+    prices.config['default'] = dict(offline.config['default'], derive_across_3markets=False)
+    assert prices.select_exchanges(['CNY']) == ['aex', 'binance', 'fixer', 'manual']
+
+
+def test_select_exchanges_of_target_price(offline):
+    exchanges = {
+        'aex': {'klass': 'Aex', 'bases': ['CNY'], 'quotes': ['BTS']},
+        'bitshares': {'klass': 'BitsharesFeed', 'assets': ['CNY']},
+        'magicwallet': {'klass': 'MagicWallet'},
+        'sina': {'klass': 'Manual', 'feed': {}},
+    }
+    config = dict(offline.config, exchanges=exchanges)
+    config['default'] = dict(offline.config['default'], sources=['aex'])
+    prices = offline.Feed(config)
+    assert prices.select_exchanges(['CNY']) == ['aex']
+    config['assets'] = {'CNY': {'target_price_algorithm': 'gugu'}}
+    assert prices.select_exchanges(['CNY']) == ['aex', 'bitshares', 'magicwallet']
+    config['assets'] = {'CNY': {'target_price_algorithm': 'guguusd'}}
+    assert prices.select_exchanges(['CNY']) == ['aex', 'bitshares', 'sina']
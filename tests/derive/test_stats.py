@@ -0,0 +1,41 @@
+import pytest
+
+from bitshares_pricefeed.stats import summarize
+
+
+def test_summarize():
+    stats = summarize([4, 1, 3, 2], [1, 1, 1, 5], trim=0.25)
+    assert stats['mean'] == 2.5
+    assert stats['median'] == 2.5
+    assert stats['weighted'] == 2.25
+    assert stats['weighted_median'] == 2
+    assert stats['trimmed'] == 2.5
+    assert stats['winsorized'] == 2.5
+    assert stats['number'] == 4
+    assert stats['rejected'] == 0
+    assert summarize([], []) is None
+    single = summarize([2], [0])
+    assert single['weighted'] == single['weighted_median'] == 2
+    assert single['std'] == 0
+
+
+def test_summarize_rejects_outliers():
+    prices = [1.0, 1.01, 0.99, 1.02, 100.0]
+    volumes = [1, 1, 1, 1, 1000]
+    assert summarize(prices, volumes)['weighted_median'] == 100.0
+    stats = summarize(prices, volumes, outlier_threshold=3)
+    assert stats['rejected'] == 1
+    assert stats['number'] == 4
+    assert stats['weighted_median'] == 1.0
+    assert stats['mean'] == pytest.approx(1.005)
+
+
+def test_summarize_keeps_prices_without_deviation():
+    stats = summarize([1.0, 1.0, 1.0, 1.001, 1.002], [1, 1, 1, 50, 50], outlier_threshold=3)
+    assert stats['rejected'] == 0
+    assert stats['weighted'] == pytest.approx((3 + 50 * 1.001 + 50 * 1.002) / 103)
+
+
+def test_summarize_without_trim():
+    stats = summarize([1, 2, 3, 10], [1, 1, 1, 1], trim=0)
+    assert stats['trimmed'] == stats['winsorized'] == stats['mean'] == 4
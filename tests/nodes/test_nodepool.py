@@ -0,0 +1,84 @@
+import json
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from bitsharesbase.chains import known_chains
+from bitshares_pricefeed.nodes import NodePool
+
+serve = pytest.importorskip("websockets.sync.server").serve
+
+
+class StandInNode(object):
+    """ Local websocket server answering the few calls the pool makes
+    """
+    def __init__(self, delay=0, lag=0):
+        self.delay = delay
+        self.lag = lag
+        self.calls = []
+        self.server = serve(self.handle, "127.0.0.1", 0, close_timeout=0.1)
+        self.url = "ws://127.0.0.1:%d" % self.server.socket.getsockname()[1]
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def handle(self, ws):
+        for message in ws:
+            query = json.loads(message)
+            _, method, args = query["params"]
+            self.calls.append(method)
+            time.sleep(self.delay)
+            ws.send(json.dumps({"id": query["id"], "jsonrpc": "2.0", "result": self.result(method, args)}))
+
+    def result(self, method, args):
+        if method == "get_chain_properties":
+            return {"chain_id": known_chains["BTS"]["chain_id"]}
+        if method == "get_dynamic_global_properties":
+            head = datetime.now(timezone.utc) - timedelta(seconds=self.lag)
+            return {"time": head.strftime("%Y-%m-%dT%H:%M:%S")}
+        if method == "get_objects":
+            return [{"id": x, "node": self.url} for x in args[0]]
+
+    def stop(self):
+        self.server.shutdown()
+
+
+@pytest.fixture
+def nodes():
+    started = []
+
+    def start(**kwargs):
+        started.append(StandInNode(**kwargs))
+        return started[-1]
+    yield start
+    for node in started:
+        node.stop()
+
+
+def test_pool_prefers_fast_fresh_nodes(nodes):
+    slow = nodes(delay=0.05)
+    fast = nodes()
+    lagging = nodes(lag=3600)
+    pool = NodePool([slow.url, lagging.url, fast.url, "ws://127.0.0.1:1"], max_lag=60)
+    assert pool.urls[:2] == [fast.url, slow.url]
+    assert [node.healthy for node in pool.ranked()] == [True, True, False, False]
+    assert pool.get_object("1.3.0")["node"] == fast.url
+    assert pool.chain_params["chain_id"] == known_chains["BTS"]["chain_id"]
+
+
+def test_pool_fails_over(nodes):
+    first = nodes()
+    second = nodes(delay=0.05)
+    pool = NodePool([first.url, second.url])
+    assert pool.get_objects(["1.3.0"])[0]["node"] == first.url
+    first.stop()
+    assert pool.get_objects(["1.3.0"])[0]["node"] == second.url
+    assert pool.best().url == second.url
+
+
+def test_pool_spreads_reads(nodes):
+    first = nodes()
+    second = nodes()
+    pool = NodePool([first.url, second.url], spread_reads=True)
+    served = set(pool.get_objects(["1.3.0"])[0]["node"] for _ in range(4))
+    assert served == {first.url, second.url}
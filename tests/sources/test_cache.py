@@ -0,0 +1,46 @@
+import os
+import time
+import pytest
+from bitshares_pricefeed.sources import SourceCache, Manual
+
+
+def test_source_cache(tmpdir):
+    cache = SourceCache(directory=str(tmpdir))
+    cache.store('abc', {'USD': {'BTS': {'price': 0.1, 'volume': 1.0}}})
+    feed, age = cache.load('abc')
+    assert feed == {'USD': {'BTS': {'price': 0.1, 'volume': 1.0}}}
+    assert age < 1
+    assert cache.load('abc', max_age=-1) is None
+    assert cache.load('unknown') is None
+    assert os.listdir(str(tmpdir)) == ['abc.json.gz']
+
+
+def test_source_cache_prune(tmpdir):
+    cache = SourceCache(directory=str(tmpdir), max_age=60)
+    for key in ('old', 'new', 'newest'):
+        cache.store(key, {})
+    old = time.time() - 120
+    os.utime(cache.path('old'), (old, old))
+    os.utime(cache.path('new'), (old + 90, old + 90))
+    cache.max_size = os.path.getsize(cache.path('newest'))
+    cache.prune()
+    assert os.listdir(str(tmpdir)) == ['newest.json.gz']
+
+
+def test_cache_keyed_per_instance(tmpdir):
+    cache = SourceCache(directory=str(tmpdir))
+    usd = Manual(allowCache=True, cache=cache, feed={'USD': {'BTS': {'price': 0.1, 'volume': 1.0}}})
+    cny = Manual(allowCache=True, cache=cache, feed={'CNY': {'BTS': {'price': 0.7, 'volume': 1.0}}})
+    usd.fetch()
+    cny.fetch()
+    assert usd.recoverFromCache() == {'USD': {'BTS': {'price': 0.1, 'volume': 1.0}}}
+    assert cny.recoverFromCache() == {'CNY': {'BTS': {'price': 0.7, 'volume': 1.0}}}
+
+
+def test_cache_failed_stores_leave_no_files(tmpdir):
+    cache = SourceCache(directory=str(tmpdir))
+    cache.store('key', {'USD': {}})
+    with pytest.raises(TypeError):
+        cache.store('key', {'USD': object()})
+    assert len(tmpdir.listdir()) == 1
+    assert cache.load('key')[0] == {'USD': {}}
@@ -103,3 +103,24 @@ def test_composite_first_valid(checkers):
     assert feed['BTS']['USD']['price'] == 2
     assert feed['BTS']['USD']['volume'] == 20
     assert feed['BTS']['USD']['source'] == 'source2'
+
+def test_composite_nested(checkers):
+    from bitshares_pricefeed.sources import fetch_all
+    inner = sample_conf.copy()
+    inner['klass'] = 'Composite'
+    inner['aggregation_type'] = 'max'
+    outer = {
+        'klass': 'Composite',
+        'aggregation_type': 'min',
+        'exchanges': {
+            'best': inner,
+            'manual': {
+                'klass': 'Manual',
+                'feed': { 'BTS': { 'USD': { 'price': 10, 'volume': 1 } } }
+            }
+        }
+    }
+    feed = fetch_all({ 'outer': outer }, max_workers=2)['outer']
+    checkers.check_feed(feed, ['USD:BTS'])
+    assert feed['BTS']['USD']['price'] == 10
+    assert feed['BTS']['USD']['source'] == 'manual'
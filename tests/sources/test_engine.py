@@ -0,0 +1,154 @@
+import time
+from bitshares_pricefeed import sources
+from bitshares_pricefeed.sources import FeedSource, fetch_all
+
+
+class Sleepy(FeedSource):
+    def _fetch(self):
+        time.sleep(0.2)
+        return self.add_rate({}, 'BTS', 'USD', 1.0, 1.0)
+
+
+def test_fetch_all_manual(checkers):
+    feed = fetch_all({
+        'manual': {'klass': 'Manual', 'feed': {'BTS': {'USD': {'price': 4.2, 'volume': 1.0}}}},
+        'disabled': {'klass': 'Manual', 'enable': False, 'feed': {}}
+    })
+    assert list(feed) == ['manual']
+    checkers.check_feed(feed['manual'], ['USD:BTS'])
+
+
+def test_fetch_all_is_concurrent(monkeypatch, checkers):
+    monkeypatch.setattr(sources, 'Sleepy', Sleepy, raising=False)
+    exchanges = {'sleepy{}'.format(i): {'klass': 'Sleepy'} for i in range(10)}
+    start = time.time()
+    feed = fetch_all(exchanges)
+    assert time.time() - start < 1.0
+    assert len(feed) == 10
+    for name in exchanges:
+        checkers.check_feed(feed[name], ['USD:BTS'])
+
+
+def test_engine_shares_http_client():
+    from bitshares_pricefeed.sources import FetchEngine, HttpClient
+    client = HttpClient(pool_maxsize=4)
+    instances = FetchEngine(http=client).instantiate({
+        'manual1': {'klass': 'Manual', 'feed': {}},
+        'manual2': {'klass': 'Manual', 'feed': {}},
+    })
+    assert all(instance.http is client for instance in instances.values())
+
+
+class Stuck(FeedSource):
+    def _fetch(self):
+        time.sleep(2)
+        return self.add_rate({}, 'BTS', 'CNY', 1.0, 1.0)
+
+
+def test_fetch_deadline(monkeypatch, checkers):
+    from bitshares_pricefeed.sources import FetchEngine
+    monkeypatch.setattr(sources, 'Sleepy', Sleepy, raising=False)
+    monkeypatch.setattr(sources, 'Stuck', Stuck, raising=False)
+    engine = FetchEngine(deadline='500ms')
+    start = time.time()
+    feed = engine.run({'stuck': {'klass': 'Stuck'}, 'sleepy': {'klass': 'Sleepy'}})
+    assert time.time() - start < 1.0
+    assert engine.late == ['stuck']
+    assert feed['stuck'] == {}
+    checkers.check_feed(feed['sleepy'], ['USD:BTS'])
+
+
+def test_fetch_deadline_recovers_like_failures(monkeypatch, tmpdir):
+    from bitshares_pricefeed.sources import FetchEngine, SourceCache
+    monkeypatch.setattr(sources, 'Stuck', Stuck, raising=False)
+    cache = SourceCache(str(tmpdir))
+    cached = {'BTS': {'CNY': {'price': 2.0, 'volume': 1.0}}}
+    cache.store(Stuck(cache=cache).fingerprint(), cached)
+
+    # Without a cache allowed, a source that may not fail is skipped
+    engine = FetchEngine(deadline='100ms', cache=cache)
+    assert engine.run({'stuck': {'klass': 'Stuck', 'allowFailure': False}}) == {'stuck': {}}
+    # A cache is only used when allowed
+    engine = FetchEngine(deadline='100ms', cache=cache)
+    assert engine.run({'stuck': {'klass': 'Stuck'}}) == {'stuck': {}}
+    engine = FetchEngine(deadline='100ms', cache=cache)
+    assert engine.run({'stuck': {'klass': 'Stuck', 'allowCache': True}}) == {'stuck': cached}
+
+
+def test_parse_duration():
+    from bitshares_pricefeed.sources import parse_duration
+    assert parse_duration(None) is None
+    assert parse_duration(3) == 3
+    assert parse_duration('8s') == 8
+    assert parse_duration('250ms') == 0.25
+    assert parse_duration('5m') == 300
+
+
+class Counting(FeedSource):
+    pair_scoped = True
+    calls = 0
+
+    def _fetch(self):
+        Counting.calls += 1
+        feed = {}
+        for base, quote in self.pairs():
+            if base == 'FAIL':
+                raise ValueError('no such market')
+            self.add_rate(feed, base, quote, 1.0, 1.0)
+        return feed
+
+
+def test_fetch_deduplicates_sources(monkeypatch, checkers):
+    from bitshares_pricefeed.sources import FetchEngine
+    monkeypatch.setattr(sources, 'Counting', Counting, raising=False)
+    Counting.calls = 0
+    engine = FetchEngine()
+    feed = engine.run({
+        'wide': {'klass': 'Counting', 'bases': ['BTS', 'CNY'], 'quotes': ['USD', 'BTC']},
+        'narrow': {'klass': 'Counting', 'bases': ['BTS'], 'quotes': ['USD']},
+        'composite': {
+            'klass': 'Composite',
+            'aggregation_type': 'max',
+            'exchanges': {
+                'same': {'klass': 'Counting', 'bases': ['BTS'], 'quotes': ['USD']},
+                'other': {'klass': 'Counting', 'bases': ['BTS'], 'quotes': ['EUR']},
+            }
+        }
+    })
+    # Only the identical 'narrow' and 'same' share a fetch
+    assert Counting.calls == 3
+    assert engine.saved == 1
+    checkers.check_feed(feed['wide'], ['USD:BTS', 'BTC:BTS', 'USD:CNY', 'BTC:CNY'])
+    assert list(feed['narrow']) == ['BTS']
+    assert list(feed['narrow']['BTS']) == ['USD']
+    checkers.check_feed(feed['composite'], ['USD:BTS', 'EUR:BTS'])
+
+
+def test_fetch_shares_only_same_fetch_options(monkeypatch):
+    from bitshares_pricefeed.sources import FetchEngine
+    monkeypatch.setattr(sources, 'Counting', Counting, raising=False)
+    Counting.calls = 0
+    engine = FetchEngine()
+    engine.run({
+        'tolerant': {'klass': 'Counting', 'bases': ['BTS'], 'quotes': ['USD']},
+        'strict': {'klass': 'Counting', 'bases': ['BTS'], 'quotes': ['USD'], 'allowFailure': False},
+        'cached': {'klass': 'Counting', 'bases': ['BTS'], 'quotes': ['USD'], 'allowCache': True, 'cacheMaxStaleness': 60},
+        'slow': {'klass': 'Counting', 'bases': ['BTS'], 'quotes': ['USD'], 'timeout': 30},
+        'stored': {'klass': 'Counting', 'bases': ['BTS'], 'quotes': ['USD'], 'refreshInterval': 3600},
+        'limited': {'klass': 'Counting', 'bases': ['BTS'], 'quotes': ['USD'], 'rateLimit': {'rate': 100}},
+        'same': {'klass': 'Counting', 'bases': ['BTS'], 'quotes': ['USD']},
+    })
+    assert Counting.calls == 6
+    assert engine.saved == 1
+
+
+def test_fetch_does_not_inherit_failures_of_wider_sources(monkeypatch, checkers):
+    from bitshares_pricefeed.sources import FetchEngine
+    monkeypatch.setattr(sources, 'Counting', Counting, raising=False)
+    engine = FetchEngine()
+    feed = engine.run({
+        'wide': {'klass': 'Counting', 'bases': ['BTS', 'FAIL'], 'quotes': ['USD']},
+        'narrow': {'klass': 'Counting', 'bases': ['BTS'], 'quotes': ['USD']},
+    })
+    assert feed['wide'] == {}
+    checkers.check_feed(feed['narrow'], ['USD:BTS'])
@@ -0,0 +1,56 @@
+import time
+import pytest
+from bitshares_pricefeed.sources import FeedSource, HealthRegistry
+
+
+class Failing(FeedSource):
+    calls = 0
+
+    def _fetch(self):
+        Failing.calls += 1
+        raise Exception('Unreachable')
+
+
+def test_circuit_breaker():
+    health = HealthRegistry(persist=False, threshold=2, backoff=0.1)
+    health.failure('key', 1.0)
+    assert health.state('key') == 'closed'
+    health.failure('key', 2.0)
+    assert health.state('key') == 'open'
+    assert not health.allow('key')
+    time.sleep(0.1)
+    assert health.state('key') == 'half-open'
+    health.failure('key', 1.0)
+    assert health.state('key') == 'open'
+    assert health.records['key']['backoff'] == 0.2
+    time.sleep(0.2)
+    health.success('key', 1.0)
+    assert health.state('key') == 'closed'
+    assert health.records['key']['failures'] == 0
+    assert 1.0 < health.records['key']['latency'] < 2.0
+
+
+def test_open_sources_are_skipped():
+    health = HealthRegistry(persist=False, threshold=2)
+    source = Failing(health=health)
+    for _ in range(3):
+        assert source.fetch() == {}
+    assert Failing.calls == 2
+
+
+def test_health_is_persisted(tmpdir):
+    state = str(tmpdir.join('health.json'))
+    health = HealthRegistry(state, threshold=1)
+    health.failure('key', 1.0, 'Unreachable')
+    health.save()
+    health = HealthRegistry(state)
+    assert health.state('key') == 'open'
+    assert health.records['key']['last_error'] == 'Unreachable'
+
+
+def test_health_failed_saves_leave_no_files(tmpdir):
+    health = HealthRegistry(str(tmpdir.join('health.json')))
+    health.failure('key', 1.0, object())
+    with pytest.raises(TypeError):
+        health.save()
+    assert tmpdir.listdir() == []
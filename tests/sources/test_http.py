@@ -0,0 +1,107 @@
+import json
+import threading
+from concurrent import futures
+from http.server import BaseHTTPRequestHandler, HTTPServer
+import pytest
+from bitshares_pricefeed.sources import FeedSource, HealthRegistry, HttpClient, ValidatorStore
+
+
+class Handler(BaseHTTPRequestHandler):
+    hits = 0
+
+    def do_GET(self):
+        Handler.hits += 1
+        if self.headers.get('If-None-Match') == '"v1"':
+            self.send_response(304)
+            self.end_headers()
+            return
+        body = json.dumps({'path': self.path}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('ETag', '"v1"')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = HTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    Handler.hits = 0
+    yield 'http://127.0.0.1:{}'.format(httpd.server_address[1])
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_http_coalesces_identical_requests(server):
+    client = HttpClient()
+    with futures.ThreadPoolExecutor(max_workers=5) as pool:
+        responses = list(pool.map(lambda _: client.get(server + '/ticker'), range(5)))
+    client.get(server + '/global')
+    assert Handler.hits == 2
+    assert client.saved == 4
+    assert all(r.json() is responses[0].json() for r in responses)
+    assert responses[0].json() == {'path': '/ticker'}
+
+    client.reset()
+    client.get(server + '/ticker')
+    assert Handler.hits == 3
+
+
+def test_http_without_coalescing(server):
+    client = HttpClient(coalesce=False)
+    client.get(server + '/ticker')
+    client.get(server + '/ticker')
+    assert Handler.hits == 2
+    assert client.saved == 0
+
+
+def test_http_conditional_requests(server, tmpdir):
+    client = HttpClient(coalesce=False, validators_dir=str(tmpdir))
+    assert client.get(server + '/rates', conditional=True).json() == {'path': '/rates'}
+    # Revalidated: answered with 304 and served from the stored body
+    response = client.get(server + '/rates', conditional=True)
+    assert response.status_code == 200
+    assert response.json() == {'path': '/rates'}
+    assert Handler.hits == 2
+
+    # Stored body reused without any request within the refresh interval
+    other = HttpClient(coalesce=False, validators_dir=str(tmpdir))
+    assert other.get(server + '/rates', refresh_interval=60).json() == {'path': '/rates'}
+    assert Handler.hits == 2
+
+
+class Rates(FeedSource):
+    conditional = True
+
+    async def _fetch_async(self):
+        data = (await self._get_async(self.url)).json()
+        if data['path'] != '/ok':
+            raise ValueError('error payload')
+        return self.add_rate({}, 'EUR', 'USD', 1.0, 1.0)
+
+
+def test_http_rejected_bodies_are_not_reused(server, tmpdir):
+    client = HttpClient(coalesce=False, validators_dir=str(tmpdir))
+    health = HealthRegistry(persist=False)
+    failing = Rates(url=server + '/error', refreshInterval=60, http=client, health=health)
+    assert failing.fetch() == {}
+    assert failing.fetch() == {}
+    assert Handler.hits == 2
+    working = Rates(url=server + '/ok', refreshInterval=60, http=client, health=health)
+    assert working.fetch() == working.fetch() != {}
+    assert Handler.hits == 3
+
+
+def test_http_failed_saves_leave_no_files(tmpdir):
+    store = ValidatorStore(str(tmpdir))
+    store.save('key', {'body': 'old'})
+    with pytest.raises(TypeError):
+        store.save('key', {'body': object()})
+    assert len(tmpdir.listdir()) == 1
+    assert store.load('key') == {'body': 'old'}
@@ -0,0 +1,59 @@
+import pytest
+from bitshares_pricefeed.sources import FeedSource, FetchEngine, HttpClient, RateLimiter, TokenBucket, QuotaExceeded
+
+
+def test_token_bucket_smooths_bursts():
+    bucket = TokenBucket(rate=2, per=1.0)
+    delays = [bucket.reserve() for _ in range(4)]
+    assert delays[:2] == [0, 0]
+    assert 0.4 < delays[2] <= 0.5
+    assert 0.9 < delays[3] <= 1.0
+
+
+def test_quota_is_persisted(tmpdir):
+    state = str(tmpdir.join('quota.json'))
+    settings = {'quota': 2}
+    limiter = RateLimiter(state)
+    limiter.acquire('key', settings)
+    limiter.save()
+
+    limiter = RateLimiter(state)
+    assert limiter.remaining('key', settings) == 1
+    limiter.acquire('key', settings)
+    with pytest.raises(QuotaExceeded):
+        limiter.acquire('key', settings)
+
+
+def test_quota_ignores_unreadable_state(tmpdir):
+    state = tmpdir.join('quota.json')
+    state.write('{"key": ')
+    assert RateLimiter(str(state)).remaining('key', {'quota': 2}) == 2
+
+
+def test_quota_prioritises_needed_pairs(tmpdir):
+    limiter = RateLimiter(str(tmpdir.join('quota.json')))
+    engine = FetchEngine(limiter=limiter, priority=['CNY'])
+    source = FeedSource(
+        quotes=['BTC'], bases=['EUR', 'CNY', 'JPY'], rateLimit={'quota': 1, 'key': 'fixer'},
+        limiter=limiter, engine=engine)
+    assert source.pairs() == [('CNY', 'BTC')]
+
+
+class Direct(FeedSource):
+    def _fetch(self):
+        self.http.get('http://127.0.0.1:9/ticker', timeout=1)
+
+
+def test_quota_is_keyed_by_host_on_every_request(tmpdir):
+    limiter = RateLimiter(str(tmpdir.join('quota.json')))
+    client = HttpClient(coalesce=False, validators_dir=str(tmpdir))
+    settings = {'quota': 1}
+    limiter.acquire('127.0.0.1:9', settings)
+    source = Direct(rateLimit=settings, http=client, limiter=limiter)
+    with pytest.raises(QuotaExceeded):
+        source._fetch()
+    assert limiter.keys_of(source.fingerprint()) == ['127.0.0.1:9']
+    assert source.quota_left() == 0
+    # The limit is not applied to sources without one
+    with pytest.raises(IOError):
+        Direct(http=client, limiter=limiter)._fetch()
@@ -0,0 +1,105 @@
+import threading
+import time
+
+from bitshares_pricefeed.pricefeed import Feed
+from bitshares_pricefeed.sources.graphene import Graphene
+from bitshares_pricefeed.sources.tickers import MarketIndex, TickerService
+
+
+class CountingTickers(TickerService):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.calls = []
+        self.calls_lock = threading.Lock()
+
+    def fetch(self, market):
+        with self.calls_lock:
+            self.calls.append(market)
+        time.sleep(0.05)
+        if market.startswith('FAIL'):
+            raise ValueError(market)
+        return {'latest': len(self.calls)}
+
+
+def test_tickers_memoised():
+    tickers = CountingTickers(ttl=60)
+    assert tickers.ticker('BTS:USD') == tickers.ticker('bts:usd')
+    assert tickers.calls == ['BTS:USD']
+    tickers.ttl = 0
+    tickers.ticker('BTS:USD')
+    assert tickers.calls == ['BTS:USD', 'BTS:USD']
+
+
+def test_tickers_prefetch_concurrently():
+    tickers = CountingTickers(ttl=60, max_workers=8)
+    start = time.time()
+    tickers.prefetch(['BTS:USD', 'BTS:CNY', 'BTS:EUR', 'BTS:USD', 'FAIL:BTS'])
+    assert time.time() - start < 0.2
+    assert sorted(tickers.calls) == ['BTS:CNY', 'BTS:EUR', 'BTS:USD', 'FAIL:BTS']
+    tickers.ticker('BTS:EUR')
+    assert len(tickers.calls) == 4
+    # Failures are not memoised
+    try:
+        tickers.ticker('FAIL:BTS')
+        assert False
+    except ValueError:
+        pass
+    assert len(tickers.calls) == 5
+
+
+def test_tickers_concurrent_requests_share_a_fetch():
+    tickers = CountingTickers(ttl=60)
+    threads = [threading.Thread(target=tickers.ticker, args=('BTS:USD',)) for _ in range(5)]
+    [t.start() for t in threads]
+    [t.join() for t in threads]
+    assert tickers.calls == ['BTS:USD']
+
+
+def test_tickers_read_again_every_run():
+    feed = Feed.__new__(Feed)
+    feed.tickers = CountingTickers(ttl=60)
+    feed.tickers.ticker('BTS:USD')
+    feed.tickers.ticker('BTS:USD')
+    feed.new_run()
+    feed.tickers.ticker('BTS:USD')
+    assert feed.tickers.calls == ['BTS:USD', 'BTS:USD']
+
+
+def test_market_index(tmpdir):
+    index = MarketIndex(state_file=str(tmpdir.join('markets.json')), max_age=60)
+    assert index.liquid('BTS:USD') is None
+    index.update('bts:usd', False)
+    assert index.liquid('BTS:USD') is False
+    index.save()
+    assert MarketIndex(state_file=str(tmpdir.join('markets.json'))).liquid('BTS:USD') is False
+    index.max_age = 0
+    assert index.liquid('BTS:USD') is None
+
+
+class DexTickers(TickerService):
+    markets = {'USD:BTS': (0.1, 100.0), 'CNY:BTS': (0.7, 50.0), 'CNY:USD': (0, 0)}
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.calls = []
+
+    def fetch(self, market):
+        self.calls.append(market)
+        latest, volume = self.markets.get(market, (0, 0))
+        self.index.update(market, latest > 0 and volume > 0)
+        return {'latest': latest, 'quoteVolume': volume}
+
+
+def test_graphene_skips_markets_without_liquidity():
+    tickers = DexTickers(ttl=60)
+    source = Graphene(quotes=['USD', 'CNY'], bases=['BTS', 'USD'], tickers=tickers)
+    feed = source.fetch()
+    assert feed['BTS']['USD']['price'] == 0.1
+    assert feed['BTS']['CNY']['price'] == 0.7
+    assert 'USD' not in feed
+    assert sorted(tickers.calls) == ['CNY:BTS', 'CNY:USD', 'USD:BTS']
+    # The empty market is not queried again while its record is recent
+    tickers.reset()
+    tickers.calls = []
+    source.fetch()
+    assert sorted(tickers.calls) == ['CNY:BTS', 'USD:BTS']
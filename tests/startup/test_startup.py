@@ -0,0 +1,33 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from bitshares_pricefeed.sources import load_source, Manual
+
+HEAVY = ['quandl', 'pandas', 'psycopg2', 'bitshares_pricefeed.sources.binance', 'bitshares_pricefeed.sources.quandl']
+
+PROBE = """
+import json, sys, time
+start = time.time()
+import bitshares_pricefeed.cli
+print(json.dumps({'time': time.time() - start, 'modules': sorted(sys.modules)}))
+"""
+
+
+def test_cli_starts_without_loading_sources():
+    import json
+    output = subprocess.check_output([sys.executable, '-c', PROBE])
+    result = json.loads(output.decode().splitlines()[-1])
+    assert [m for m in HEAVY if m in result['modules']] == []
+    budget = float(os.environ.get('PRICEFEED_STARTUP_BUDGET', 3))
+    assert result['time'] < budget
+
+
+def test_load_source():
+    assert load_source('Manual') is Manual
+    klass = load_source('Binance')
+    assert klass.__module__ == 'bitshares_pricefeed.sources.binance'
+    with pytest.raises(ValueError):
+        load_source('Unknown')